@@ -6,9 +6,11 @@ import (
 	"log"
 	"net"
 	"strconv"
+	"time"
 
 	"go.opentelemetry.io/contrib/instrumentation/google.golang.org/grpc/otelgrpc"
 	"google.golang.org/grpc"
+	"google.golang.org/grpc/keepalive"
 	"google.golang.org/grpc/reflection"
 
 	authzv1 "cedar/api/gen/v1"
@@ -39,6 +41,12 @@ func (s *Server) Start() error {
 
 	s.grpcServer = grpc.NewServer(
 		grpc.StatsHandler(otelgrpc.NewServerHandler()),
+		// Accept client keepalive pings on long-lived shared channels
+		// instead of closing the connection with too_many_pings.
+		grpc.KeepaliveEnforcementPolicy(keepalive.EnforcementPolicy{
+			MinTime:             20 * time.Second,
+			PermitWithoutStream: true,
+		}),
 	)
 	authzv1.RegisterAuthorizationServiceServer(s.grpcServer, s)
 
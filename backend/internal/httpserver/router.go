@@ -294,6 +294,15 @@ func NewRouter(cfg config.Config, authzSvc *authz.Service, apps *storage.Applica
 	r.Use(middleware.RealIP)
 	r.Use(middleware.Recoverer)
 
+	// Identify the serving instance on every response so clients behind the
+	// load balancer don't need a separate /v1/cluster/status call
+	r.Use(func(next http.Handler) http.Handler {
+		return http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+			w.Header().Set("X-Instance-Id", instanceID)
+			next.ServeHTTP(w, r)
+		})
+	})
+
 	// Request counting middleware
 	if instanceRegistry != nil {
 		r.Use(func(next http.Handler) http.Handler {
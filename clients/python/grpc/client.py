@@ -16,13 +16,171 @@ Example usage:
     )
     print(f"Allowed: {result.allowed}")
 """
+import threading
+
 import grpc
+import grpc.aio
 from . import authz_pb2
 from . import authz_pb2_grpc
 
 
-class EPMClient:
-    """Enterprise Policy Management gRPC Client"""
+# Context value setters keyed by exact type, so bools are not coerced to
+# int_value (isinstance(True, int) is True). Other types are skipped.
+_CONTEXT_SETTERS = {
+    str: lambda field, value: setattr(field, "string_value", value),
+    bool: lambda field, value: setattr(field, "bool_value", value),
+    int: lambda field, value: setattr(field, "int_value", value),
+}
+
+
+def _apply_context(target, context: dict) -> None:
+    """Copy a context dict into a protobuf map<string, Value> field."""
+    if not context:
+        return
+    for key, value in context.items():
+        setter = _CONTEXT_SETTERS.get(type(value))
+        if setter is not None:
+            setter(target[key], value)
+
+
+# Options for long-lived channels: keepalive pings keep idle HTTP/2
+# connections from being silently dropped by proxies/NATs
+_CHANNEL_OPTIONS = [
+    ("grpc.max_receive_message_length", 16 * 1024 * 1024),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+# Sync channels shared by all EPMClient instances so they multiplex over
+# one HTTP/2 connection per target: key -> (channel, credentials). The
+# credentials object is held so its id() stays unique while cached.
+_CHANNEL_CACHE: dict = {}
+_CHANNEL_LOCK = threading.Lock()
+
+
+def _shared_channel(target: str, secure: bool, credentials=None) -> grpc.Channel:
+    """Return the registered channel for target, creating it on first use."""
+    key = (target, secure, id(credentials) if credentials is not None else None)
+    with _CHANNEL_LOCK:
+        cached = _CHANNEL_CACHE.get(key)
+        if cached is not None:
+            return cached[0]
+        
+        if secure:
+            channel = grpc.secure_channel(
+                target,
+                credentials or grpc.ssl_channel_credentials(),
+                options=_CHANNEL_OPTIONS
+            )
+        else:
+            channel = grpc.insecure_channel(target, options=_CHANNEL_OPTIONS)
+        _CHANNEL_CACHE[key] = (channel, credentials)
+        return channel
+
+
+def shutdown_channels() -> None:
+    """Close all shared channels. Existing EPMClient instances become unusable."""
+    with _CHANNEL_LOCK:
+        cached = list(_CHANNEL_CACHE.values())
+        _CHANNEL_CACHE.clear()
+    for channel, _ in cached:
+        channel.close()
+
+
+# Upper bound on cached Entity messages per client
+_ENTITY_CACHE_MAX_SIZE = 4096
+
+# BatchCheck payloads repeat the same type strings per check, so gzip them
+# once they are large enough for compression to pay off. Single checks are
+# never compressed.
+_BATCH_COMPRESSION_MIN_CHECKS = 16
+
+
+def _batch_compression(checks: list):
+    """Per-call compression for a BatchCheck of the given size."""
+    if len(checks) >= _BATCH_COMPRESSION_MIN_CHECKS:
+        return grpc.Compression.Gzip
+    return None
+
+
+class _RequestBuilder:
+    """Builds request messages shared by the sync and asyncio clients."""
+    
+    def __init__(self):
+        # Immutable Entity messages reused across requests
+        self._entity_cache: dict = {}
+    
+    def _entity(self, entity_type: str, entity_id: str) -> authz_pb2.Entity:
+        """Return a shared Entity message. Callers must not mutate it."""
+        key = (entity_type, entity_id)
+        entity = self._entity_cache.get(key)
+        if entity is None:
+            if len(self._entity_cache) >= _ENTITY_CACHE_MAX_SIZE:
+                self._entity_cache.clear()
+            entity = authz_pb2.Entity(type=entity_type, id=entity_id)
+            self._entity_cache[key] = entity
+        return entity
+    
+    def _check_request(
+        self,
+        app_id: str,
+        principal_type: str,
+        principal_id: str,
+        action_type: str,
+        action_id: str,
+        resource_type: str,
+        resource_id: str,
+        context: dict = None
+    ) -> authz_pb2.CheckRequest:
+        entity = self._entity
+        request = authz_pb2.CheckRequest(application_id=app_id)
+        request.principal.CopyFrom(entity(principal_type, principal_id))
+        request.action.CopyFrom(entity(action_type, action_id))
+        request.resource.CopyFrom(entity(resource_type, resource_id))
+        _apply_context(request.context, context)
+        return request
+    
+    def _batch_check_request(self, checks: list) -> authz_pb2.BatchCheckRequest:
+        entity = self._entity
+        requests = []
+        for check in checks:
+            req = authz_pb2.CheckRequest(application_id=check["app_id"])
+            req.principal.CopyFrom(entity(check["principal_type"], check["principal_id"]))
+            req.action.CopyFrom(entity(check["action_type"], check["action_id"]))
+            req.resource.CopyFrom(entity(check["resource_type"], check["resource_id"]))
+            _apply_context(req.context, check.get("context"))
+            requests.append(req)
+        
+        return authz_pb2.BatchCheckRequest(checks=requests)
+    
+    def _lookup_resources_request(
+        self,
+        app_id: str,
+        principal_type: str,
+        principal_id: str,
+        action_type: str,
+        action_id: str,
+        resource_type: str,
+        context: dict = None
+    ) -> authz_pb2.LookupResourcesRequest:
+        request = authz_pb2.LookupResourcesRequest(
+            application_id=app_id,
+            resource_type=resource_type,
+        )
+        request.principal.CopyFrom(self._entity(principal_type, principal_id))
+        request.action.CopyFrom(self._entity(action_type, action_id))
+        _apply_context(request.context, context)
+        return request
+
+
+class EPMClient(_RequestBuilder):
+    """
+    Enterprise Policy Management gRPC Client
+    
+    Clients for the same target share one channel. close() releases only
+    this client; call shutdown_channels() to close the shared channels.
+    """
     
     def __init__(self, target: str, secure: bool = False, credentials=None):
         """
@@ -33,12 +191,8 @@ class EPMClient:
             secure: Use TLS connection
             credentials: Optional gRPC credentials for secure connections
         """
-        if secure:
-            if credentials is None:
-                credentials = grpc.ssl_channel_credentials()
-            self.channel = grpc.secure_channel(target, credentials)
-        else:
-            self.channel = grpc.insecure_channel(target)
+        super().__init__()
+        self.channel = _shared_channel(target, secure, credentials)
         
         self.stub = authz_pb2_grpc.AuthorizationServiceStub(self.channel)
     
@@ -51,64 +205,45 @@ class EPMClient:
         action_id: str,
         resource_type: str,
         resource_id: str,
-        context: dict = None
+        context: dict = None,
+        timeout: float = None,
+        metadata=None
     ) -> authz_pb2.CheckResponse:
         """
         Perform an authorization check.
         
+        timeout (seconds) and metadata are passed through to the RPC.
+        
         Returns:
             CheckResponse with allowed, reasons, and errors fields
         """
-        request = authz_pb2.CheckRequest(
-            application_id=app_id,
-            principal=authz_pb2.Entity(type=principal_type, id=principal_id),
-            action=authz_pb2.Entity(type=action_type, id=action_id),
-            resource=authz_pb2.Entity(type=resource_type, id=resource_id),
+        request = self._check_request(
+            app_id, principal_type, principal_id,
+            action_type, action_id, resource_type, resource_id, context
         )
-        
-        if context:
-            for key, value in context.items():
-                if isinstance(value, str):
-                    request.context[key].string_value = value
-                elif isinstance(value, int):
-                    request.context[key].int_value = value
-                elif isinstance(value, bool):
-                    request.context[key].bool_value = value
-        
-        return self.stub.Check(request)
+        return self.stub.Check(request, timeout=timeout, metadata=metadata)
     
-    def batch_check(self, checks: list) -> authz_pb2.BatchCheckResponse:
+    def batch_check(
+        self, checks: list, timeout: float = None, metadata=None
+    ) -> authz_pb2.BatchCheckResponse:
         """
         Perform multiple authorization checks in parallel.
         
         Args:
             checks: List of dicts with keys: app_id, principal_type, principal_id,
                    action_type, action_id, resource_type, resource_id, context
+            timeout: Optional deadline in seconds for the RPC
+            metadata: Optional gRPC metadata, as (key, value) pairs
         
         Returns:
             BatchCheckResponse with results list
         """
-        requests = []
-        for check in checks:
-            req = authz_pb2.CheckRequest(
-                application_id=check["app_id"],
-                principal=authz_pb2.Entity(
-                    type=check["principal_type"],
-                    id=check["principal_id"]
-                ),
-                action=authz_pb2.Entity(
-                    type=check["action_type"],
-                    id=check["action_id"]
-                ),
-                resource=authz_pb2.Entity(
-                    type=check["resource_type"],
-                    id=check["resource_id"]
-                ),
-            )
-            requests.append(req)
-        
-        batch_request = authz_pb2.BatchCheckRequest(checks=requests)
-        return self.stub.BatchCheck(batch_request)
+        return self.stub.BatchCheck(
+            self._batch_check_request(checks),
+            compression=_batch_compression(checks),
+            timeout=timeout,
+            metadata=metadata
+        )
     
     def lookup_resources(
         self,
@@ -118,39 +253,149 @@ class EPMClient:
         action_type: str,
         action_id: str,
         resource_type: str,
-        context: dict = None
+        context: dict = None,
+        timeout: float = None,
+        metadata=None
     ) -> list:
         """
         Look up resources the principal can access.
         
+        timeout (seconds) and metadata are passed through to the RPC.
+        
         Returns:
             List of resource IDs
         """
-        request = authz_pb2.LookupResourcesRequest(
-            application_id=app_id,
-            principal=authz_pb2.Entity(type=principal_type, id=principal_id),
-            action=authz_pb2.Entity(type=action_type, id=action_id),
-            resource_type=resource_type,
+        request = self._lookup_resources_request(
+            app_id, principal_type, principal_id,
+            action_type, action_id, resource_type, context
         )
-        
-        if context:
-            for key, value in context.items():
-                if isinstance(value, str):
-                    request.context[key].string_value = value
-                elif isinstance(value, int):
-                    request.context[key].int_value = value
-                elif isinstance(value, bool):
-                    request.context[key].bool_value = value
-        
-        response = self.stub.LookupResources(request)
+        response = self.stub.LookupResources(request, timeout=timeout, metadata=metadata)
         return list(response.resource_ids)
     
     def close(self):
-        """Close the gRPC channel."""
-        self.channel.close()
+        """Release this client. The shared channel stays open for other clients."""
+        self._entity_cache.clear()
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
+
+
+class AsyncEPMClient(_RequestBuilder):
+    """
+    Enterprise Policy Management gRPC Client for asyncio (grpc.aio).
+    
+    Must be created and used from within a running event loop.
+    
+    Example:
+        async with AsyncEPMClient("localhost:50051") as client:
+            result = await client.check(...)
+    """
+    
+    def __init__(self, target: str, secure: bool = False, credentials=None):
+        """
+        Initialize the client.
+        
+        Args:
+            target: gRPC server address (e.g., "localhost:50051")
+            secure: Use TLS connection
+            credentials: Optional gRPC credentials for secure connections
+        """
+        super().__init__()
+        # Not shared: grpc.aio channels are bound to the creating event loop
+        if secure:
+            if credentials is None:
+                credentials = grpc.ssl_channel_credentials()
+            self.channel = grpc.aio.secure_channel(target, credentials, options=_CHANNEL_OPTIONS)
+        else:
+            self.channel = grpc.aio.insecure_channel(target, options=_CHANNEL_OPTIONS)
+        
+        self.stub = authz_pb2_grpc.AuthorizationServiceStub(self.channel)
+    
+    async def check(
+        self,
+        app_id: str,
+        principal_type: str,
+        principal_id: str,
+        action_type: str,
+        action_id: str,
+        resource_type: str,
+        resource_id: str,
+        context: dict = None,
+        timeout: float = None,
+        metadata=None
+    ) -> authz_pb2.CheckResponse:
+        """
+        Perform an authorization check.
+        
+        timeout (seconds) and metadata are passed through to the RPC.
+        
+        Returns:
+            CheckResponse with allowed, reasons, and errors fields
+        """
+        request = self._check_request(
+            app_id, principal_type, principal_id,
+            action_type, action_id, resource_type, resource_id, context
+        )
+        return await self.stub.Check(request, timeout=timeout, metadata=metadata)
+    
+    async def batch_check(
+        self, checks: list, timeout: float = None, metadata=None
+    ) -> authz_pb2.BatchCheckResponse:
+        """
+        Perform multiple authorization checks in parallel.
+        
+        Args:
+            checks: List of dicts with keys: app_id, principal_type, principal_id,
+                   action_type, action_id, resource_type, resource_id, context
+            timeout: Optional deadline in seconds for the RPC
+            metadata: Optional gRPC metadata, as (key, value) pairs
+        
+        Returns:
+            BatchCheckResponse with results list
+        """
+        return await self.stub.BatchCheck(
+            self._batch_check_request(checks),
+            compression=_batch_compression(checks),
+            timeout=timeout,
+            metadata=metadata
+        )
+    
+    async def lookup_resources(
+        self,
+        app_id: str,
+        principal_type: str,
+        principal_id: str,
+        action_type: str,
+        action_id: str,
+        resource_type: str,
+        context: dict = None,
+        timeout: float = None,
+        metadata=None
+    ) -> list:
+        """
+        Look up resources the principal can access.
+        
+        timeout (seconds) and metadata are passed through to the RPC.
+        
+        Returns:
+            List of resource IDs
+        """
+        request = self._lookup_resources_request(
+            app_id, principal_type, principal_id,
+            action_type, action_id, resource_type, context
+        )
+        response = await self.stub.LookupResources(request, timeout=timeout, metadata=metadata)
+        return list(response.resource_ids)
+    
+    async def close(self):
+        """Close the gRPC channel."""
+        await self.channel.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
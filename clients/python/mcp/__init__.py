@@ -31,12 +31,13 @@ Example:
 
 from .authorizer import CedarMCPAuthorizer, CedarMCPConfig
 from .cache import CachedAuthzClient
-from .sse import SSESubscriber
+from .sse import AsyncSSESubscriber, SSESubscriber
 
 __all__ = [
     "CedarMCPAuthorizer",
     "CedarMCPConfig",
     "CachedAuthzClient", 
     "SSESubscriber",
+    "AsyncSSESubscriber",
 ]
 
@@ -5,10 +5,15 @@ This module provides the main CedarMCPAuthorizer class that MCP servers
 can use to enforce authorization on tool calls.
 """
 
+import asyncio
 import functools
 import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
 
 from .cache import CachedAuthzClient
 from .sse import SSESubscriber, create_cache_invalidator
@@ -26,8 +31,9 @@ class CedarMCPConfig:
     # Cedar backend URL
     cedar_url: str = "http://localhost:8080"
     
-    # gRPC URL (optional, for lower latency)
-    grpc_url: str = "localhost:50051"
+    # gRPC URL (opt-in, for lower latency, e.g. "localhost:50051"; None
+    # uses REST only)
+    grpc_url: Optional[str] = None
     
     # Application ID in Cedar
     app_id: int = 1
@@ -85,24 +91,44 @@ class CedarMCPAuthorizer:
         """Initialize the authorizer with configuration."""
         self.config = config
         
+        # Interned once so cache-key tuples reuse the same string objects
+        self._principal_type = sys.intern(config.default_principal_type)
+        self._tool_resource_type = sys.intern(config.default_tool_resource_type)
+        
         # Initialize cached client
         self._client = CachedAuthzClient(
             base_url=config.cedar_url,
             app_id=config.app_id,
             cache_ttl=config.cache_ttl_seconds,
             cache_max_size=config.cache_max_size,
-            headers=config.auth_headers
+            headers=config.auth_headers,
+            grpc_url=config.grpc_url
+        )
+        
+        # Reduced tool entitlements per user, LRU-bounded by cache_max_size:
+        # user_id -> ((candidates, exact), expires_at)
+        self._allowed_actions_cache: "OrderedDict[str, Tuple[Tuple[Set[str], bool], float]]" = (
+            OrderedDict()
         )
+        self._allowed_actions_lock = threading.Lock()
         
         # Initialize SSE subscriber for real-time invalidation
         self._sse_subscriber: Optional[SSESubscriber] = None
+        self._cache_invalidator = None
         if config.enable_sse:
             self._start_sse_subscriber()
     
     def _start_sse_subscriber(self) -> None:
         """Start SSE subscriber for cache invalidation."""
         try:
-            invalidator = create_cache_invalidator(self._client._cache)
+            cache_invalidator = create_cache_invalidator(self._client._cache)
+            self._cache_invalidator = cache_invalidator
+            
+            def invalidator(event) -> None:
+                cache_invalidator(event)
+                if event.event_type in ("policy_updated", "entity_updated"):
+                    self._clear_allowed_actions()
+            
             self._sse_subscriber = SSESubscriber(
                 url=f"{self.config.cedar_url}/v1/events",
                 on_event=invalidator,
@@ -136,7 +162,7 @@ class CedarMCPAuthorizer:
         Returns:
             True if authorized, False otherwise
         """
-        principal_type = user_type or self.config.default_principal_type
+        principal_type = user_type or self._principal_type
         
         try:
             return self._client.check(
@@ -152,6 +178,37 @@ class CedarMCPAuthorizer:
             # Fail closed on errors
             return False
     
+    async def authorize_async(
+        self,
+        user_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        context: Optional[Dict[str, Any]] = None,
+        user_type: Optional[str] = None
+    ) -> bool:
+        """
+        Async version of authorize() that does not block the event loop.
+        
+        Returns:
+            True if authorized, False otherwise
+        """
+        principal_type = user_type or self._principal_type
+        
+        try:
+            return await self._client.check_async(
+                principal_type=principal_type,
+                principal_id=user_id,
+                action=action,
+                resource_type=resource_type,
+                resource_id=resource_id,
+                context=context
+            )
+        except Exception as e:
+            logger.error(f"Authorization check failed: {e}")
+            # Fail closed on errors
+            return False
+    
     def authorize_tool(
         self,
         tool_name: str,
@@ -172,7 +229,7 @@ class CedarMCPAuthorizer:
         return self.authorize(
             user_id=user_id,
             action=tool_name,
-            resource_type=self.config.default_tool_resource_type,
+            resource_type=self._tool_resource_type,
             resource_id=tool_name,
             context=context
         )
@@ -194,17 +251,127 @@ class CedarMCPAuthorizer:
         Returns:
             Filtered list of authorized tools
         """
-        authorized_tools = []
-        for tool in tools:
-            tool_name = getattr(tool, tool_name_attr, None)
-            if tool_name is None:
-                # Try dict access
-                tool_name = tool.get(tool_name_attr) if isinstance(tool, dict) else None
-            
-            if tool_name and self.authorize_tool(tool_name, user_id):
-                authorized_tools.append(tool)
+        if not tools:
+            return []
+        
+        # Checked per tool, so lists mixing dicts and objects keep every name
+        def name_of(tool):
+            if isinstance(tool, dict):
+                return tool.get(tool_name_attr)
+            return getattr(tool, tool_name_attr, None)
+        
+        named_tools = [(name_of(tool), tool) for tool in tools]
+        named_tools = [(tool_name, tool) for tool_name, tool in named_tools if tool_name]
+        if not named_tools:
+            return []
+        
+        # Every decision comes from one batch check. The entitlements summary
+        # is regex-parsed, so it only narrows which tools are sent: when it
+        # is exact, tools it never permits are denied unchecked.
+        names = [tool_name for tool_name, _ in named_tools]
+        reduced = self._get_allowed_actions_cached(user_id)
+        if reduced is not None and reduced[1]:
+            candidates = reduced[0]
+            names = [tool_name for tool_name in names if tool_name in candidates]
+        # Deduplicated, in tool order
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+        
+        principal_type = self._principal_type
+        resource_type = self._tool_resource_type
+        checks = [
+            (principal_type, user_id, tool_name, resource_type, tool_name, None)
+            for tool_name in names
+        ]
         
-        return authorized_tools
+        try:
+            decisions = self._client.batch_check(checks)
+        except Exception as e:
+            logger.error(f"Batch authorization check failed: {e}")
+            # Fail closed on errors
+            return []
+        
+        allowed = {name for name, ok in zip(names, decisions) if ok}
+        return [tool for tool_name, tool in named_tools if tool_name in allowed]
+    
+    def _get_allowed_actions_cached(self, user_id: str) -> Optional[Tuple[Set[str], bool]]:
+        """
+        Get the reduced tool entitlements of a user, memoized for the cache TTL.
+        
+        Returns:
+            (candidates, exact) as from _tool_actions_from_entitlements, or
+            None if the summary does not apply (the endpoint only lists User
+            permissions) or the entitlements endpoint is unreachable
+        """
+        # /v1/entitlements always resolves the username as a User principal
+        if self._principal_type != "User":
+            return None
+        
+        now = time.monotonic()
+        with self._allowed_actions_lock:
+            cached = self._allowed_actions_cache.get(user_id)
+            if cached is not None and cached[1] > now:
+                self._allowed_actions_cache.move_to_end(user_id)
+                return cached[0]
+        
+        try:
+            entitlements = self.get_user_entitlements(user_id)
+        except Exception as e:
+            logger.warning(f"Entitlements lookup failed, using per-tool checks: {e}")
+            return None
+        
+        reduced = self._tool_actions_from_entitlements(entitlements)
+        
+        with self._allowed_actions_lock:
+            cache = self._allowed_actions_cache
+            cache[user_id] = (reduced, now + self.config.cache_ttl_seconds)
+            cache.move_to_end(user_id)
+            while len(cache) > self.config.cache_max_size:
+                cache.popitem(last=False)
+        return reduced
+    
+    def _tool_actions_from_entitlements(
+        self, entitlements: Dict[str, Any]
+    ) -> Tuple[Set[str], bool]:
+        """
+        Reduce entitlements to the tool actions worth checking.
+        
+        candidates are the actions of unconditional permits on the tool
+        resource type. They are not grants: the summary misses "unless"
+        clauses, so every candidate still goes through a real check, which
+        also applies forbids. exact is False when a conditional,
+        resource-scoped or all-action permit applies to tools; then tools
+        outside candidates may be allowed too and must be checked as well.
+        """
+        resource_type = self._tool_resource_type
+        
+        entries = list(entitlements.get("entitlements") or [])
+        for group_entries in (entitlements.get("group_entitlements") or {}).values():
+            entries.extend(group_entries)
+        
+        candidates: Set[str] = set()
+        exact = True
+        for entry in entries:
+            # A forbid can only deny, and the real check applies it
+            if entry.get("effect") != "permit":
+                continue
+            resource_types = entry.get("resource_types") or []
+            if resource_types and resource_type not in resource_types and "*" not in resource_types:
+                continue
+            actions = entry.get("actions") or []
+            scoped = entry.get("conditions") or entry.get("resource_ids")
+            if scoped or not actions or "*" in actions:
+                exact = False
+                continue
+            candidates.update(actions)
+        
+        return candidates, exact
+    
+    def _clear_allowed_actions(self) -> None:
+        """Drop all memoized allowed-action sets."""
+        with self._allowed_actions_lock:
+            self._allowed_actions_cache.clear()
     
     def get_user_entitlements(
         self,
@@ -284,48 +451,37 @@ class CedarMCPAuthorizer:
                 ...
         """
         def decorator(func: F) -> F:
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                # Extract user_id from kwargs
+            # Resolved once per decorated function, not per call
+            act = action or func.__name__
+            res_type = resource_type or self._tool_resource_type
+            res_id = resource_id or act
+            
+            def user_id_of(kwargs) -> str:
                 uid = kwargs.get(user_id_param)
                 if uid is None:
                     raise ValueError(f"Missing required parameter: {user_id_param}")
+                return uid
+            
+            def deny(uid: str) -> PermissionError:
+                return PermissionError(f"User {uid} is not authorized to perform {act}")
+            
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    uid = user_id_of(kwargs)
+                    if not await self.authorize_async(uid, act, res_type, res_id):
+                        raise deny(uid)
+                    return await func(*args, **kwargs)
                 
-                # Determine action
-                act = action or func.__name__
-                res_type = resource_type or self.config.default_tool_resource_type
-                res_id = resource_id or act
-                
-                if not self.authorize(uid, act, res_type, res_id):
-                    raise PermissionError(
-                        f"User {uid} is not authorized to perform {act}"
-                    )
-                
-                return func(*args, **kwargs)
+                return async_wrapper  # type: ignore
             
             @functools.wraps(func)
-            async def async_wrapper(*args, **kwargs):
-                # Extract user_id from kwargs
-                uid = kwargs.get(user_id_param)
-                if uid is None:
-                    raise ValueError(f"Missing required parameter: {user_id_param}")
-                
-                # Determine action
-                act = action or func.__name__
-                res_type = resource_type or self.config.default_tool_resource_type
-                res_id = resource_id or act
-                
+            def wrapper(*args, **kwargs):
+                uid = user_id_of(kwargs)
                 if not self.authorize(uid, act, res_type, res_id):
-                    raise PermissionError(
-                        f"User {uid} is not authorized to perform {act}"
-                    )
-                
-                return await func(*args, **kwargs)
+                    raise deny(uid)
+                return func(*args, **kwargs)
             
-            # Return appropriate wrapper based on function type
-            import asyncio
-            if asyncio.iscoroutinefunction(func):
-                return async_wrapper  # type: ignore
             return wrapper  # type: ignore
         
         return decorator
@@ -340,6 +496,7 @@ class CedarMCPAuthorizer:
         Returns:
             Number of entries invalidated
         """
+        self._clear_allowed_actions()
         return self._client.invalidate(app_id)
     
     @property
@@ -349,8 +506,21 @@ class CedarMCPAuthorizer:
     
     def close(self) -> None:
         """Close the authorizer and stop background tasks."""
+        self._stop_sse()
+        self._client.close()
+    
+    async def aclose(self) -> None:
+        """Close the authorizer, including asyncio transports."""
+        self._stop_sse()
+        await self._client.aclose()
+    
+    def _stop_sse(self) -> None:
+        """Stop the SSE subscriber and its cache invalidation thread."""
         if self._sse_subscriber:
             self._sse_subscriber.stop()
+        # on_event is a wrapper, so the subscriber cannot close this itself
+        if self._cache_invalidator is not None:
+            self._cache_invalidator.close()
     
     def __enter__(self):
         return self
@@ -5,32 +5,42 @@ This module provides a TTL-based in-memory cache to reduce round-trips
 to the Cedar backend for repeated authorization checks.
 """
 
-import hashlib
+import asyncio
 import json
+import logging
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+logger = logging.getLogger(__name__)
 
 @dataclass
 class CacheEntry:
     """Represents a cached authorization decision."""
+    # No per-instance __dict__: keeps large caches compact (works on 3.8+,
+    # unlike dataclass(slots=True))
+    __slots__ = ("allowed", "reasons", "expires_at")
+    
     allowed: bool
-    reasons: List[str]
-    timestamp: float
-    ttl: float
+    reasons: Tuple[str, ...]
+    # Deadline on the time.monotonic() clock
+    expires_at: float
     
-    def is_expired(self) -> bool:
-        """Check if this cache entry has expired."""
-        return time.time() > self.timestamp + self.ttl
+    def is_expired(self, now: float) -> bool:
+        """Check if this cache entry has expired as of now (time.monotonic())."""
+        return now > self.expires_at
 
 
 class AuthzCache:
     """
     Thread-safe TTL cache for authorization decisions.
     
-    Supports selective invalidation by app_id for real-time updates.
+    Entries are evicted in least-recently-used order once max_size is
+    reached. Supports selective invalidation by app_id for real-time updates.
+    Reads do not take the lock; writers serialize on it. Hit/miss counters
+    are updated without locking and are approximate under contention.
     """
     
     def __init__(self, default_ttl: float = 60.0, max_size: int = 10000):
@@ -41,15 +51,16 @@ class AuthzCache:
             default_ttl: Default TTL in seconds for cache entries
             max_size: Maximum number of entries before eviction
         """
-        self._cache: Dict[str, CacheEntry] = {}
+        self._cache: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        # Secondary index: app_id -> cache keys, for O(k) invalidation
+        self._by_app: Dict[int, Set[tuple]] = {}
         self._lock = threading.RLock()
         self._default_ttl = default_ttl
         self._max_size = max_size
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "invalidations": 0,
-        }
+        # Plain int counters, bumped without the lock (stats are approximate)
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
     
     def _make_key(
         self,
@@ -60,17 +71,36 @@ class AuthzCache:
         resource_type: str,
         resource_id: str,
         context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generate a cache key from authorization parameters."""
-        key_data = {
-            "app_id": app_id,
-            "principal": f"{principal_type}::{principal_id}",
-            "action": action,
-            "resource": f"{resource_type}::{resource_id}",
-            "context": json.dumps(context or {}, sort_keys=True),
-        }
-        key_str = json.dumps(key_data, sort_keys=True)
-        return hashlib.sha256(key_str.encode()).hexdigest()
+    ) -> tuple:
+        """
+        Generate a cache key from authorization parameters.
+        
+        The key is a plain tuple so lookups hash in C using the elements'
+        cached string hashes; app_id is always key[0].
+        """
+        return (
+            app_id, principal_type, principal_id,
+            action, resource_type, resource_id,
+            self._context_key(context) if context else ()
+        )
+    
+    @staticmethod
+    def _context_key(context: Optional[Dict[str, Any]]) -> Any:
+        """
+        Build a hashable, order-independent key for a context dict.
+        
+        Each value is tagged with its type: 1, 1.0 and True are equal and
+        hash alike, but Cedar evaluates them differently.
+        """
+        if not context:
+            return ()
+        items = tuple(sorted((k, type(v).__name__, v) for k, v in context.items()))
+        try:
+            hash(items)
+        except TypeError:
+            # Nested (unhashable) values: fall back to canonical JSON
+            return json.dumps(context, sort_keys=True, separators=(",", ":"))
+        return items
     
     def get(
         self,
@@ -92,19 +122,31 @@ class AuthzCache:
             action, resource_type, resource_id, context
         )
         
-        with self._lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                self._stats["misses"] += 1
-                return None
-            
-            if entry.is_expired():
-                del self._cache[key]
-                self._stats["misses"] += 1
-                return None
-            
-            self._stats["hits"] += 1
-            return entry
+        now = time.monotonic()
+        
+        # Lock-free read: OrderedDict.get/move_to_end are single C calls and
+        # atomic under the GIL; the lock is only taken to drop an expired entry
+        cache = self._cache
+        entry = cache.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        
+        if entry.is_expired(now):
+            with self._lock:
+                if cache.get(key) is entry:
+                    self._remove(key)
+            self._misses += 1
+            return None
+        
+        try:
+            cache.move_to_end(key)
+        except KeyError:
+            # Evicted or invalidated by a concurrent writer; the entry we
+            # read was still valid
+            pass
+        self._hits += 1
+        return entry
     
     def set(
         self,
@@ -125,22 +167,21 @@ class AuthzCache:
             action, resource_type, resource_id, context
         )
         
+        entry = CacheEntry(
+            allowed=allowed,
+            reasons=tuple(reasons) if reasons else (),
+            expires_at=time.monotonic() + (ttl or self._default_ttl)
+        )
+        
         with self._lock:
-            # Evict expired entries if at capacity
-            if len(self._cache) >= self._max_size:
-                self._evict_expired()
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            self._by_app.setdefault(app_id, set()).add(key)
             
-            # If still at capacity, remove oldest entry
-            if len(self._cache) >= self._max_size:
-                oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k].timestamp)
-                del self._cache[oldest_key]
-            
-            self._cache[key] = CacheEntry(
-                allowed=allowed,
-                reasons=reasons or [],
-                timestamp=time.time(),
-                ttl=ttl or self._default_ttl
-            )
+            # Evict least recently used entries beyond capacity
+            while len(self._cache) > self._max_size:
+                oldest_key, _ = self._cache.popitem(last=False)
+                self._unindex(oldest_key)
     
     def invalidate_app(self, app_id: int) -> int:
         """
@@ -148,54 +189,48 @@ class AuthzCache:
         
         Returns the number of entries invalidated.
         """
-        prefix = f'"app_id": {app_id}'
-        count = 0
-        
         with self._lock:
-            # We need to regenerate keys to find matches, but for efficiency
-            # we store app_id in a way that can be checked
-            keys_to_remove = []
-            for key, entry in self._cache.items():
-                # Check if this key belongs to the app
-                # Since we hash the key, we need to track app_id separately
-                # For simplicity, clear all and let it refill
-                pass
-            
-            # For now, clear all entries (simple but effective)
-            # In production, you'd want to track app_id -> keys mapping
-            count = len(self._cache)
-            self._cache.clear()
-            self._stats["invalidations"] += 1
+            keys = self._by_app.pop(app_id, ())
+            for key in keys:
+                self._cache.pop(key, None)
+            self._invalidations += 1
         
-        return count
+        return len(keys)
     
     def invalidate_all(self) -> int:
         """Clear all cache entries."""
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
-            self._stats["invalidations"] += 1
+            self._by_app.clear()
+            self._invalidations += 1
             return count
     
-    def _evict_expired(self) -> int:
-        """Remove all expired entries. Must be called with lock held."""
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired()
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-        return len(expired_keys)
+    def _remove(self, key: tuple) -> None:
+        """Remove a single entry and its index slot. Must be called with lock held."""
+        del self._cache[key]
+        self._unindex(key)
+    
+    def _unindex(self, key: tuple) -> None:
+        """Drop a key from the app_id index. Must be called with lock held."""
+        app_keys = self._by_app.get(key[0])
+        if app_keys is not None:
+            app_keys.discard(key)
+            if not app_keys:
+                del self._by_app[key[0]]
     
     @property
     def stats(self) -> Dict[str, int]:
         """Get cache statistics."""
-        with self._lock:
-            return {
-                **self._stats,
-                "size": len(self._cache),
-                "hit_rate": self._stats["hits"] / max(1, self._stats["hits"] + self._stats["misses"])
-            }
+        hits = self._hits
+        misses = self._misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "invalidations": self._invalidations,
+            "size": len(self._cache),
+            "hit_rate": hits / max(1, hits + misses)
+        }
 
 
 class CachedAuthzClient:
@@ -203,6 +238,8 @@ class CachedAuthzClient:
     Authorization client with built-in caching.
     
     Wraps REST API calls with a TTL cache for better performance.
+    When a gRPC URL is configured, cache misses are resolved over gRPC
+    and fall back to REST if the gRPC client is unavailable.
     """
     
     def __init__(
@@ -211,7 +248,9 @@ class CachedAuthzClient:
         app_id: int,
         cache_ttl: float = 60.0,
         cache_max_size: int = 10000,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        grpc_url: Optional[str] = None,
+        timeout: float = 5.0
     ):
         """
         Initialize the cached client.
@@ -222,11 +261,75 @@ class CachedAuthzClient:
             cache_ttl: Cache TTL in seconds
             cache_max_size: Maximum cache entries
             headers: Optional HTTP headers (e.g., for authentication)
+            grpc_url: Optional gRPC address (e.g., "localhost:50051") used
+                      for authorization checks instead of REST
+            timeout: Timeout in seconds for each authorization call (REST or gRPC)
         """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         self.base_url = base_url.rstrip("/")
         self.app_id = app_id
         self.headers = headers or {}
+        self.timeout = timeout
         self._cache = AuthzCache(default_ttl=cache_ttl, max_size=cache_max_size)
+        
+        # Pre-build endpoint URLs so the hot path skips string formatting
+        self._authorize_url = f"{self.base_url}/v1/authorize"
+        self._entitlements_url = f"{self.base_url}/v1/entitlements"
+        
+        # Pooled session: reuses TCP/TLS connections across cache misses
+        self._session = requests.Session()
+        self._session.headers.update({"Connection": "keep-alive", **self.headers})
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, cache_max_size // 10),
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # gRPC clients are created lazily on the first cache miss. Every call
+        # gets the same deadline as REST, and the auth headers as metadata
+        # (gRPC metadata keys must be lowercase).
+        self._grpc_url = grpc_url
+        self._grpc_client = None
+        self._aio_grpc_client = None
+        self._grpc_call_options = {
+            "timeout": timeout,
+            "metadata": tuple((k.lower(), v) for k, v in self.headers.items()) or None,
+        }
+        
+        # Singleflight state: cache key -> event set when the leader finishes
+        self._inflight: Dict[tuple, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+        self._inflight_async: Dict[tuple, asyncio.Event] = {}
+        self._inflight_timeout = 5.0
+    
+    def _get_grpc_client(self):
+        """Return the gRPC client, or None if gRPC is not configured/available."""
+        if self._grpc_client is None and self._grpc_url:
+            try:
+                from ..grpc.client import EPMClient
+            except ImportError as e:
+                logger.warning(f"gRPC client unavailable, using REST: {e}")
+                self._grpc_url = None
+                return None
+            self._grpc_client = EPMClient(self._grpc_url)
+        return self._grpc_client
+    
+    def _get_aio_grpc_client(self):
+        """Return the asyncio gRPC client, or None if gRPC is not configured/available."""
+        if self._aio_grpc_client is None and self._grpc_url:
+            try:
+                from ..grpc.client import AsyncEPMClient
+            except ImportError as e:
+                logger.warning(f"gRPC client unavailable, using REST: {e}")
+                self._grpc_url = None
+                return None
+            self._aio_grpc_client = AsyncEPMClient(self._grpc_url)
+        return self._aio_grpc_client
     
     def check(
         self,
@@ -250,11 +353,12 @@ class CachedAuthzClient:
             context: Optional context for the authorization check
             bypass_cache: If True, skip cache and fetch from backend
         
+        Concurrent cache misses for the same request are coalesced into a
+        single backend call.
+        
         Returns:
             True if authorized, False otherwise
         """
-        import requests
-        
         # Check cache first (unless bypassed)
         if not bypass_cache:
             cached = self._cache.get(
@@ -264,26 +368,77 @@ class CachedAuthzClient:
             if cached is not None:
                 return cached.allowed
         
-        # Make API call
-        payload = {
-            "application_id": self.app_id,
-            "principal": {"type": principal_type, "id": principal_id},
-            "action": {"type": "Action", "id": action},
-            "resource": {"type": resource_type, "id": resource_id},
-            "context": context or {}
-        }
+        if bypass_cache:
+            return self._resolve(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
         
-        response = requests.post(
-            f"{self.base_url}/v1/authorize",
-            json=payload,
-            headers=self.headers,
-            timeout=5.0
+        # Singleflight: only one caller per key hits the backend; concurrent
+        # callers for the same key wait for its result
+        key = self._cache._make_key(
+            self.app_id, principal_type, principal_id,
+            action, resource_type, resource_id, context
         )
-        response.raise_for_status()
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            is_leader = event is None
+            if is_leader:
+                event = threading.Event()
+                self._inflight[key] = event
         
-        result = response.json()
-        allowed = result.get("decision") == "allow"
-        reasons = result.get("reasons", [])
+        if not is_leader:
+            if event.wait(timeout=self._inflight_timeout):
+                cached = self._cache.get(
+                    self.app_id, principal_type, principal_id,
+                    action, resource_type, resource_id, context
+                )
+                if cached is not None:
+                    return cached.allowed
+            # Leader failed or timed out: resolve independently
+            return self._resolve(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+        
+        try:
+            return self._resolve(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            event.set()
+    
+    def _resolve(
+        self,
+        principal_type: str,
+        principal_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        context: Optional[Dict[str, Any]]
+    ) -> bool:
+        """Fetch a decision from the backend and cache it."""
+        # Make API call (gRPC when available, REST otherwise)
+        decision = None
+        grpc_client = self._get_grpc_client()
+        if grpc_client is not None:
+            try:
+                decision = self._check_grpc(
+                    grpc_client, principal_type, principal_id,
+                    action, resource_type, resource_id, context
+                )
+            except Exception as e:
+                logger.warning(f"gRPC check failed, falling back to REST: {e}")
+        
+        if decision is None:
+            decision = self._check_rest(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+        allowed, reasons = decision
         
         # Update cache
         self._cache.set(
@@ -296,6 +451,308 @@ class CachedAuthzClient:
         
         return allowed
     
+    async def check_async(
+        self,
+        principal_type: str,
+        principal_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        context: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False
+    ) -> bool:
+        """
+        Async version of check() that does not block the event loop.
+        
+        Cache misses are resolved with grpc.aio when gRPC is available;
+        the REST fallback runs in the loop's default executor.
+        """
+        if not bypass_cache:
+            cached = self._cache.get(
+                self.app_id, principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+            if cached is not None:
+                return cached.allowed
+        
+        if bypass_cache:
+            return await self._resolve_async(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+        
+        # Singleflight, as in check(); the event loop serializes access to
+        # the in-flight map so no lock is needed
+        key = self._cache._make_key(
+            self.app_id, principal_type, principal_id,
+            action, resource_type, resource_id, context
+        )
+        event = self._inflight_async.get(key)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=self._inflight_timeout)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                cached = self._cache.get(
+                    self.app_id, principal_type, principal_id,
+                    action, resource_type, resource_id, context
+                )
+                if cached is not None:
+                    return cached.allowed
+            # Leader failed or timed out: resolve independently
+            return await self._resolve_async(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+        
+        event = asyncio.Event()
+        self._inflight_async[key] = event
+        try:
+            return await self._resolve_async(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+        finally:
+            del self._inflight_async[key]
+            event.set()
+    
+    async def _resolve_async(
+        self,
+        principal_type: str,
+        principal_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        context: Optional[Dict[str, Any]]
+    ) -> bool:
+        """Async version of _resolve()."""
+        decision = None
+        aio_client = self._get_aio_grpc_client()
+        if aio_client is not None:
+            try:
+                response = await aio_client.check(
+                    **self._grpc_check_args(
+                        principal_type, principal_id,
+                        action, resource_type, resource_id, context
+                    ),
+                    **self._grpc_call_options
+                )
+                decision = response.allowed, list(response.reasons)
+            except Exception as e:
+                logger.warning(f"gRPC check failed, falling back to REST: {e}")
+        
+        if decision is None:
+            loop = asyncio.get_running_loop()
+            decision = await loop.run_in_executor(
+                None, self._check_rest,
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+        allowed, reasons = decision
+        
+        self._cache.set(
+            self.app_id, principal_type, principal_id,
+            action, resource_type, resource_id,
+            allowed=allowed,
+            reasons=reasons,
+            context=context
+        )
+        
+        return allowed
+    
+    def batch_check(
+        self,
+        checks: List[Tuple[str, str, str, str, str, Optional[Dict[str, Any]]]]
+    ) -> List[bool]:
+        """
+        Check several authorization requests with a single round-trip.
+        
+        Cached decisions are answered locally; the remaining checks are sent
+        in one gRPC BatchCheck call (or individually over REST if gRPC is
+        unavailable) and their results are cached.
+        
+        Args:
+            checks: List of (principal_type, principal_id, action,
+                    resource_type, resource_id, context) tuples
+        
+        Returns:
+            List of decisions in the same order as checks
+        """
+        results, misses = self._lookup_batch(checks)
+        if not misses:
+            return results
+        
+        decisions = None
+        grpc_client = self._get_grpc_client()
+        if grpc_client is not None:
+            try:
+                response = grpc_client.batch_check(
+                    self._grpc_batch_args(checks, misses), **self._grpc_call_options
+                )
+                decisions = self._decode_batch(response, misses)
+            except Exception as e:
+                logger.warning(f"gRPC batch check failed, falling back to REST: {e}")
+        
+        if decisions is None:
+            decisions = [self._check_rest(*checks[i]) for i in misses]
+        
+        self._store_batch(checks, misses, decisions, results)
+        return results
+    
+    async def batch_check_async(
+        self,
+        checks: List[Tuple[str, str, str, str, str, Optional[Dict[str, Any]]]]
+    ) -> List[bool]:
+        """Async version of batch_check() that does not block the event loop."""
+        results, misses = self._lookup_batch(checks)
+        if not misses:
+            return results
+        
+        decisions = None
+        aio_client = self._get_aio_grpc_client()
+        if aio_client is not None:
+            try:
+                response = await aio_client.batch_check(
+                    self._grpc_batch_args(checks, misses), **self._grpc_call_options
+                )
+                decisions = self._decode_batch(response, misses)
+            except Exception as e:
+                logger.warning(f"gRPC batch check failed, falling back to REST: {e}")
+        
+        if decisions is None:
+            loop = asyncio.get_running_loop()
+            decisions = await asyncio.gather(*(
+                loop.run_in_executor(None, self._check_rest, *checks[i])
+                for i in misses
+            ))
+        
+        self._store_batch(checks, misses, decisions, results)
+        return results
+    
+    def _lookup_batch(
+        self,
+        checks: List[Tuple[str, str, str, str, str, Optional[Dict[str, Any]]]]
+    ) -> Tuple[List[Optional[bool]], List[int]]:
+        """Answer cached checks; return partial results and indexes of misses."""
+        results: List[Optional[bool]] = [None] * len(checks)
+        misses = []
+        for i, (principal_type, principal_id, action, resource_type, resource_id, context) in enumerate(checks):
+            cached = self._cache.get(
+                self.app_id, principal_type, principal_id,
+                action, resource_type, resource_id, context
+            )
+            if cached is not None:
+                results[i] = cached.allowed
+            else:
+                misses.append(i)
+        return results, misses
+    
+    def _store_batch(
+        self,
+        checks: List[Tuple[str, str, str, str, str, Optional[Dict[str, Any]]]],
+        misses: List[int],
+        decisions: List[Tuple[bool, List[str]]],
+        results: List[Optional[bool]]
+    ) -> None:
+        """Cache resolved decisions and fill them into results."""
+        for i, (allowed, reasons) in zip(misses, decisions):
+            principal_type, principal_id, action, resource_type, resource_id, context = checks[i]
+            self._cache.set(
+                self.app_id, principal_type, principal_id,
+                action, resource_type, resource_id,
+                allowed=allowed,
+                reasons=reasons,
+                context=context
+            )
+            results[i] = allowed
+    
+    def _grpc_check_args(
+        self,
+        principal_type: str,
+        principal_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Map check() arguments onto EPMClient.check keyword arguments."""
+        return {
+            "app_id": str(self.app_id),
+            "principal_type": principal_type,
+            "principal_id": principal_id,
+            "action_type": "Action",
+            "action_id": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "context": context,
+        }
+    
+    def _grpc_batch_args(
+        self,
+        checks: List[Tuple[str, str, str, str, str, Optional[Dict[str, Any]]]],
+        misses: List[int]
+    ) -> List[Dict[str, Any]]:
+        """Map the missed checks onto EPMClient.batch_check dicts."""
+        return [self._grpc_check_args(*checks[i]) for i in misses]
+    
+    @staticmethod
+    def _decode_batch(response, misses: List[int]) -> List[Tuple[bool, List[str]]]:
+        """Decode a BatchCheckResponse into (allowed, reasons) pairs."""
+        if len(response.results) != len(misses):
+            raise ValueError(
+                f"BatchCheck returned {len(response.results)} results for {len(misses)} checks"
+            )
+        return [(r.allowed, list(r.reasons)) for r in response.results]
+    
+    def _check_grpc(
+        self,
+        grpc_client,
+        principal_type: str,
+        principal_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Tuple[bool, List[str]]:
+        """Resolve an authorization decision over gRPC."""
+        response = grpc_client.check(
+            **self._grpc_check_args(
+                principal_type, principal_id,
+                action, resource_type, resource_id, context
+            ),
+            **self._grpc_call_options
+        )
+        return response.allowed, list(response.reasons)
+    
+    def _check_rest(
+        self,
+        principal_type: str,
+        principal_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Tuple[bool, List[str]]:
+        """Resolve an authorization decision over REST."""
+        payload = {
+            "application_id": self.app_id,
+            "principal": {"type": principal_type, "id": principal_id},
+            "action": {"type": "Action", "id": action},
+            "resource": {"type": resource_type, "id": resource_id},
+            "context": context or {}
+        }
+        
+        response = self._session.post(
+            self._authorize_url,
+            json=payload,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        
+        result = response.json()
+        return result.get("decision") == "allow", result.get("reasons", [])
+    
     def get_entitlements(
         self,
         username: str,
@@ -313,8 +770,6 @@ class CachedAuthzClient:
         Returns:
             Entitlements response with user and group permissions
         """
-        import requests
-        
         payload = {
             "application_id": self.app_id,
             "username": username,
@@ -322,10 +777,9 @@ class CachedAuthzClient:
             "include_inherited": include_inherited
         }
         
-        response = requests.post(
-            f"{self.base_url}/v1/entitlements",
+        response = self._session.post(
+            self._entitlements_url,
             json=payload,
-            headers=self.headers,
             timeout=10.0
         )
         response.raise_for_status()
@@ -351,4 +805,18 @@ class CachedAuthzClient:
     def cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         return self._cache.stats
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session and gRPC channel."""
+        self._session.close()
+        if self._grpc_client is not None:
+            self._grpc_client.close()
+            self._grpc_client = None
+    
+    async def aclose(self) -> None:
+        """Close the asyncio gRPC channel, then the sync transports."""
+        if self._aio_grpc_client is not None:
+            await self._aio_grpc_client.close()
+            self._aio_grpc_client = None
+        self.close()
 
@@ -5,25 +5,211 @@ This module provides real-time cache invalidation by subscribing
 to policy update events from the Cedar backend.
 """
 
+import asyncio
+import inspect
 import json
 import logging
+import queue
+import random
+import socket
 import threading
 import time
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on a single event's data, so a stream that never terminates
+# an event cannot grow memory without limit
+DEFAULT_MAX_EVENT_BYTES = 8 * 1024 * 1024
 
-@dataclass
+# Use orjson for event payloads when installed; its JSONDecodeError
+# subclasses json.JSONDecodeError, so error handling is unchanged
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Frozen so handlers cannot alter an event shared between them. eq=False
+# keeps identity equality/hashing: with value equality, frozen would
+# generate a __hash__ that raises TypeError on the dict field.
+@dataclass(frozen=True, eq=False)
 class PolicyEvent:
     """Represents a policy update event."""
+    # No per-event __dict__ (works on 3.8+, unlike dataclass(slots=True))
+    __slots__ = ("event_type", "app_id", "timestamp", "data")
+    
     event_type: str
     app_id: Optional[int]
     timestamp: str
     data: Optional[dict]
 
 
+class _EventTooLarge(ValueError):
+    """
+    Raised by the parser when an event exceeds max_event_bytes.
+    
+    events holds the (event_type, data) pairs completed earlier in the same
+    chunk, so the caller can still deliver them before reconnecting.
+    """
+    
+    def __init__(self, max_event_bytes: int, events: List[Tuple[Optional[str], bytes]]):
+        super().__init__(f"SSE event exceeds {max_event_bytes} bytes")
+        self.events = events
+
+
+class _EventParser:
+    """
+    Incremental SSE parser shared by the sync and asyncio subscribers.
+    
+    Works on raw bytes: chunks are appended to one bytearray and scanned
+    for newlines from where the last scan stopped, so a long line is never
+    rescanned or recopied as more of it arrives (consumed lines are cut
+    from the front, which bytearray does without moving the tail). Fields
+    are dispatched with one dict lookup on the bytes before the first
+    colon, and data is decoded only as part of the JSON parse of a
+    completed event.
+    """
+    
+    def __init__(self, max_event_bytes: int = DEFAULT_MAX_EVENT_BYTES):
+        self.max_event_bytes = max_event_bytes
+        self._buf = bytearray()
+        # Offset in _buf up to which there is no newline
+        self._scanned = 0
+        self._fields = {b"data": self._on_data, b"event": self._on_event}
+        self.event_type: Optional[str] = None
+        # Most events have a single data line, held as-is; a list is only
+        # built once a second data line arrives
+        self.data: Optional[bytes] = None
+        self.data_lines: Optional[List[bytes]] = None
+        self.data_size = 0
+    
+    def feed_chunk(self, chunk: bytes) -> List[Tuple[Optional[str], bytes]]:
+        """
+        Consume a chunk of the stream.
+        
+        Returns:
+            (event_type, data) for each event completed by the chunk
+        
+        Raises:
+            _EventTooLarge: If the pending event, including a line still
+                            being received, exceeds max_event_bytes. The
+                            parser is reset, and the exception carries the
+                            events the chunk completed before the oversized
+                            one.
+        """
+        buf = self._buf
+        buf += chunk
+        
+        events = []
+        start = 0
+        end = buf.find(b"\n", self._scanned)
+        if end != -1:
+            try:
+                with memoryview(buf) as view:
+                    while end != -1:
+                        event = self.feed(bytes(view[start:end]))
+                        if event is not None:
+                            events.append(event)
+                        start = end + 1
+                        end = buf.find(b"\n", start)
+            except ValueError:
+                self._reset()
+                raise _EventTooLarge(self.max_event_bytes, events) from None
+            del buf[:start]
+        self._scanned = len(buf)
+        
+        # The unterminated tail counts against the pending event, so a line
+        # that never ends is cut off once it passes the cap
+        if len(buf) + self.data_size > self.max_event_bytes:
+            self._reset()
+            raise _EventTooLarge(self.max_event_bytes, events)
+        return events
+    
+    def _reset(self) -> None:
+        """Drop the buffered input and the pending event."""
+        self._buf.clear()
+        self._scanned = 0
+        self.event_type = None
+        self.data = None
+        self.data_lines = None
+        self.data_size = 0
+    
+    def feed(self, line: bytes) -> Optional[Tuple[Optional[str], bytes]]:
+        """
+        Consume one line of the stream, without its LF terminator.
+        
+        Returns:
+            (event_type, data) when the line completes an event, else None
+        
+        Raises:
+            ValueError: If the pending event exceeds max_event_bytes
+        """
+        # SSE lines may end in CRLF; that CR is the only thing to strip
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        
+        # Empty line = event complete
+        if not line:
+            result = None
+            if self.data is not None:
+                data = self.data if self.data_lines is None else b"\n".join(self.data_lines)
+                result = (self.event_type, data)
+            self.event_type = None
+            self.data = None
+            self.data_lines = None
+            self.data_size = 0
+            return result
+        
+        # Comments (keepalives, colon at 0) and fieldless lines are skipped;
+        # only data and event have handlers, so id and retry are ignored
+        i = line.find(b":")
+        if i <= 0:
+            return None
+        handler = self._fields.get(line[:i])
+        if handler is not None:
+            handler(line[i + 1:].lstrip())
+        return None
+    
+    def _on_data(self, value: bytes) -> None:
+        self.data_size += len(value)
+        if self.data_size > self.max_event_bytes:
+            raise ValueError(f"SSE event exceeds {self.max_event_bytes} bytes")
+        if self.data is None:
+            self.data = value
+        elif self.data_lines is None:
+            self.data_lines = [self.data, value]
+        else:
+            self.data_lines.append(value)
+    
+    def _on_event(self, value: bytes) -> None:
+        self.event_type = value.decode("utf-8")
+
+
+def _parse_event(event_type: Optional[str], data: bytes) -> PolicyEvent:
+    """Build a PolicyEvent from an event's type and data. Raises on bad JSON."""
+    # json.loads and orjson.loads both accept UTF-8 bytes directly
+    payload = _json_loads(data) if data else {}
+    
+    return PolicyEvent(
+        event_type=event_type or payload.get("type", "unknown"),
+        app_id=payload.get("app_id"),
+        timestamp=payload.get("timestamp", ""),
+        data=payload.get("data")
+    )
+
+
+def _close_handler(on_event) -> None:
+    """Close an on_event handler that owns resources (e.g. a cache invalidator)."""
+    close = getattr(on_event, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception as e:
+            logger.warning(f"Failed to close SSE event handler: {e}")
+
+
 class SSESubscriber:
     """
     Subscribes to Cedar policy update events via Server-Sent Events.
@@ -50,7 +236,9 @@ class SSESubscriber:
         app_id: Optional[int] = None,
         headers: Optional[dict] = None,
         reconnect_delay: float = 5.0,
-        max_reconnect_delay: float = 60.0
+        max_reconnect_delay: float = 60.0,
+        chunk_size: int = 65536,
+        max_event_bytes: int = DEFAULT_MAX_EVENT_BYTES
     ):
         """
         Initialize the SSE subscriber.
@@ -62,6 +250,9 @@ class SSESubscriber:
             headers: Optional HTTP headers (e.g., for authentication)
             reconnect_delay: Initial reconnect delay in seconds
             max_reconnect_delay: Maximum reconnect delay
+            chunk_size: Bytes to read from the stream per socket read
+            max_event_bytes: Largest event accepted; a bigger one drops the
+                             connection and reconnects
         """
         self.url = url
         if app_id:
@@ -71,106 +262,121 @@ class SSESubscriber:
         self.headers = headers or {}
         self.reconnect_delay = reconnect_delay
         self.max_reconnect_delay = max_reconnect_delay
+        self.chunk_size = chunk_size
+        self.max_event_bytes = max_event_bytes
         
-        self._running = False
+        # Set while stopped; waits on it double as interruptible sleeps
+        self._stop_event = threading.Event()
+        self._stop_event.set()
         self._thread: Optional[threading.Thread] = None
+        self._session = None
+        self._response = None
         self._current_delay = reconnect_delay
     
     def start(self) -> None:
         """Start the SSE subscriber in a background thread."""
-        if self._running:
+        if not self._stop_event.is_set():
             return
         
-        self._running = True
+        import requests
+        
+        # One session for all reconnects keeps the connection pool and
+        # avoids a fresh TCP/TLS handshake per attempt
+        self._session = requests.Session()
+        self._session.headers.update({**self.headers, "Accept": "text/event-stream"})
+        
+        self._stop_event.clear()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
         logger.info(f"SSE subscriber started: {self.url}")
     
     def stop(self) -> None:
         """Stop the SSE subscriber."""
-        self._running = False
+        self._stop_event.set()
+        
+        # Unblock a read waiting on the open stream. Shut the socket down
+        # rather than closing the response: close() would wait on the
+        # reader thread's buffer lock.
+        response = self._response
+        if response is not None:
+            connection = getattr(response.raw, "_connection", None)
+            sock = getattr(connection, "sock", None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        
         if self._thread:
             self._thread.join(timeout=5.0)
             self._thread = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        _close_handler(self.on_event)
         logger.info("SSE subscriber stopped")
     
     def _run(self) -> None:
         """Main loop for SSE subscription."""
-        while self._running:
+        while not self._stop_event.is_set():
             try:
                 self._connect_and_listen()
                 # Reset delay on successful connection
                 self._current_delay = self.reconnect_delay
             except Exception as e:
+                if self._stop_event.is_set():
+                    # Stream closed by stop()
+                    return
                 logger.warning(f"SSE connection error: {e}")
-                if self._running:
-                    logger.info(f"Reconnecting in {self._current_delay}s...")
-                    time.sleep(self._current_delay)
-                    # Exponential backoff
-                    self._current_delay = min(
-                        self._current_delay * 2,
-                        self.max_reconnect_delay
-                    )
+                # Full jitter so subscribers don't reconnect in lockstep
+                # after a backend restart
+                delay = random.uniform(self.reconnect_delay, self._current_delay)
+                logger.info(f"Reconnecting in {delay:.1f}s...")
+                if self._stop_event.wait(delay):
+                    return
+                # Exponential backoff
+                self._current_delay = min(
+                    self._current_delay * 2,
+                    self.max_reconnect_delay
+                )
     
     def _connect_and_listen(self) -> None:
         """Connect to SSE endpoint and process events."""
-        import requests
-        
-        with requests.get(
+        with self._session.get(
             self.url,
-            headers={**self.headers, "Accept": "text/event-stream"},
             stream=True,
             timeout=(10.0, None)  # 10s connect timeout, no read timeout
         ) as response:
             response.raise_for_status()
             logger.debug(f"Connected to SSE endpoint: {self.url}")
+            self._response = response
             
-            event_type = None
-            data_lines = []
-            
-            for line in response.iter_lines(decode_unicode=True):
-                if not self._running:
-                    break
-                
-                if line is None:
-                    continue
-                
-                line = line.strip() if line else ""
-                
-                # Empty line = event complete
-                if not line:
-                    if data_lines:
-                        self._process_event(event_type, "\n".join(data_lines))
-                    event_type = None
-                    data_lines = []
-                    continue
-                
-                # Comment (keepalive)
-                if line.startswith(":"):
-                    continue
-                
-                # Parse field
-                if ":" in line:
-                    field, _, value = line.partition(":")
-                    value = value.lstrip()
+            try:
+                parser = _EventParser(self.max_event_bytes)
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if self._stop_event.is_set():
+                        break
+                    if not chunk:
+                        continue
                     
-                    if field == "event":
-                        event_type = value
-                    elif field == "data":
-                        data_lines.append(value)
-                    # Ignore other fields (id, retry)
+                    try:
+                        events = parser.feed_chunk(chunk)
+                    except _EventTooLarge as e:
+                        # Deliver what completed before the oversized event
+                        # (a missed policy update would leave stale
+                        # decisions cached), then reconnect
+                        for event in e.events:
+                            self._process_event(*event)
+                        raise
+                    for event in events:
+                        self._process_event(*event)
+            finally:
+                self._response = None
     
-    def _process_event(self, event_type: Optional[str], data: str) -> None:
+    def _process_event(self, event_type: Optional[str], data: bytes) -> None:
         """Process a received SSE event."""
         try:
-            payload = json.loads(data) if data else {}
-            
-            event = PolicyEvent(
-                event_type=event_type or payload.get("type", "unknown"),
-                app_id=payload.get("app_id"),
-                timestamp=payload.get("timestamp", ""),
-                data=payload.get("data")
-            )
+            event = _parse_event(event_type, data)
             
             logger.debug(f"Received event: {event.event_type} for app {event.app_id}")
             self.on_event(event)
@@ -183,7 +389,7 @@ class SSESubscriber:
     @property
     def is_running(self) -> bool:
         """Check if the subscriber is running."""
-        return self._running
+        return not self._stop_event.is_set()
     
     def __enter__(self):
         self.start()
@@ -193,24 +399,262 @@ class SSESubscriber:
         self.stop()
 
 
-def create_cache_invalidator(cache) -> Callable[[PolicyEvent], None]:
+class AsyncSSESubscriber:
+    """
+    asyncio variant of SSESubscriber.
+    
+    Runs on the caller's event loop instead of a dedicated thread, so one
+    loop can hold many subscriptions. Requires httpx.
+    
+    Example:
+        subscriber = AsyncSSESubscriber(
+            url="http://localhost:8080/v1/events",
+            on_event=on_policy_update
+        )
+        task = asyncio.create_task(subscriber.run())
+        ...
+        subscriber.stop()
+        await task
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        on_event: Callable[[PolicyEvent], Union[None, Awaitable[None]]],
+        app_id: Optional[int] = None,
+        headers: Optional[dict] = None,
+        reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 60.0,
+        max_event_bytes: int = DEFAULT_MAX_EVENT_BYTES
+    ):
+        """
+        Initialize the SSE subscriber.
+        
+        Args:
+            url: SSE endpoint URL (e.g., "http://localhost:8080/v1/events")
+            on_event: Callback for policy events; may be a coroutine function
+            app_id: Optional app ID to filter events
+            headers: Optional HTTP headers (e.g., for authentication)
+            reconnect_delay: Initial reconnect delay in seconds
+            max_reconnect_delay: Maximum reconnect delay
+            max_event_bytes: Largest event accepted; a bigger one drops the
+                             connection and reconnects
+        """
+        self.url = url
+        if app_id:
+            self.url = f"{url}?app_id={app_id}"
+        
+        self.on_event = on_event
+        self.headers = headers or {}
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_event_bytes = max_event_bytes
+        
+        # Created in run() so it binds to the running loop (Python < 3.10)
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stopped = False
+        self._current_delay = reconnect_delay
+    
+    async def run(self) -> None:
+        """Subscribe until stop() is called, reconnecting with backoff."""
+        import httpx
+        
+        self._stop_event = asyncio.Event()
+        if self._stopped:
+            return
+        
+        timeout = httpx.Timeout(10.0, read=None)  # 10s connect timeout, no read timeout
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            logger.info(f"Async SSE subscriber started: {self.url}")
+            while not self._stop_event.is_set():
+                try:
+                    if await self._until_stopped(self._connect_and_listen(client)):
+                        break
+                    # Reset delay on successful connection
+                    self._current_delay = self.reconnect_delay
+                except Exception as e:
+                    logger.warning(f"SSE connection error: {e}")
+                    # Full jitter so subscribers don't reconnect in lockstep
+                    # after a backend restart
+                    delay = random.uniform(self.reconnect_delay, self._current_delay)
+                    logger.info(f"Reconnecting in {delay:.1f}s...")
+                    if await self._until_stopped(asyncio.sleep(delay)):
+                        break
+                    # Exponential backoff
+                    self._current_delay = min(
+                        self._current_delay * 2,
+                        self.max_reconnect_delay
+                    )
+        
+        logger.info("Async SSE subscriber stopped")
+    
+    async def _until_stopped(self, coro) -> bool:
+        """
+        Await coro unless stop() is called first.
+        
+        Returns:
+            True if stopped (coro is cancelled), False if coro completed
+        """
+        task = asyncio.ensure_future(coro)
+        stopper = asyncio.ensure_future(self._stop_event.wait())
+        done, _ = await asyncio.wait({task, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        
+        if task in done:
+            stopper.cancel()
+            task.result()
+            return False
+        
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+        return True
+    
+    async def _connect_and_listen(self, client) -> None:
+        """Connect to SSE endpoint and process events."""
+        headers = {**self.headers, "Accept": "text/event-stream"}
+        async with client.stream("GET", self.url, headers=headers) as response:
+            response.raise_for_status()
+            logger.debug(f"Connected to SSE endpoint: {self.url}")
+            
+            parser = _EventParser(self.max_event_bytes)
+            async for chunk in response.aiter_bytes():
+                try:
+                    events = parser.feed_chunk(chunk)
+                except _EventTooLarge as e:
+                    # Deliver what completed before the oversized event,
+                    # then reconnect
+                    for event in e.events:
+                        await self._process_event(*event)
+                    raise
+                for event in events:
+                    await self._process_event(*event)
+    
+    async def _process_event(self, event_type: Optional[str], data: bytes) -> None:
+        """Process a received SSE event."""
+        try:
+            event = _parse_event(event_type, data)
+            
+            logger.debug(f"Received event: {event.event_type} for app {event.app_id}")
+            result = self.on_event(event)
+            if inspect.isawaitable(result):
+                await result
+            
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse SSE data: {e}")
+        except Exception as e:
+            logger.error(f"Error processing SSE event: {e}")
+    
+    def stop(self) -> None:
+        """Stop the subscriber; run() returns shortly after."""
+        self._stopped = True
+        if self._stop_event is not None:
+            self._stop_event.set()
+        _close_handler(self.on_event)
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the subscriber is running."""
+        return self._stop_event is not None and not self._stop_event.is_set()
+
+
+# Queued by _CacheInvalidator.close() to stop its consumer thread
+_STOP = object()
+
+
+class _CacheInvalidator:
+    """
+    Event handler returned by create_cache_invalidator.
+    
+    Callable with a PolicyEvent; close() stops the consumer thread after it
+    has applied everything already queued. A later event starts a new one,
+    so a restarted subscriber keeps working.
+    """
+    
+    def __init__(self, cache, coalesce_ms: float):
+        self._cache = cache
+        self._coalesce_s = coalesce_ms / 1000.0
+        # app_id per event; None means invalidate everything
+        self._pending: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def __call__(self, event: PolicyEvent) -> None:
+        if event.event_type not in ("policy_updated", "entity_updated"):
+            return
+        
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._consume, args=(self._pending,),
+                    name="cache-invalidator", daemon=True
+                )
+                self._thread.start()
+            pending = self._pending
+        pending.put(event.app_id or None)
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Apply queued invalidations, then stop the consumer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            pending, self._pending = self._pending, queue.SimpleQueue()
+        if thread is not None:
+            pending.put(_STOP)
+            thread.join(timeout)
+    
+    def _consume(self, pending: "queue.SimpleQueue") -> None:
+        stopping = False
+        while not stopping:
+            first = pending.get()
+            if first is _STOP:
+                return
+            app_ids = {first}
+            if self._coalesce_s > 0:
+                time.sleep(self._coalesce_s)
+            while True:
+                try:
+                    app_id = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if app_id is _STOP:
+                    stopping = True
+                    break
+                app_ids.add(app_id)
+            
+            try:
+                if None in app_ids:
+                    logger.info("Invalidating entire cache")
+                    self._cache.invalidate_all()
+                    continue
+                for app_id in app_ids:
+                    logger.info(f"Invalidating cache for app {app_id}")
+                    self._cache.invalidate_app(app_id)
+            except Exception as e:
+                logger.error(f"Cache invalidation failed: {e}")
+
+
+def create_cache_invalidator(cache, coalesce_ms: float = 0.0) -> _CacheInvalidator:
     """
     Create an event handler that invalidates a cache on policy updates.
     
+    The handler only enqueues the event's app_id; a background thread does
+    the invalidation, so a slow cache never stalls the SSE reader. Whatever
+    is queued when the thread wakes is merged, so a burst of updates for an
+    app costs a single invalidate_app() call (and any app-less event
+    collapses the burst into one invalidate_all()).
+    
+    Call close() on the handler to stop its thread; SSESubscriber.stop()
+    does this when the handler is its on_event.
+    
     Args:
         cache: A cache object with invalidate_app(app_id) method
+        coalesce_ms: Extra wait in milliseconds before invalidating, to
+                     merge larger bursts. Cached decisions may be served
+                     stale for that long after a policy change, so the
+                     default is 0.
     
     Returns:
-        Event handler function
+        Event handler, with a close() method
     """
-    def handler(event: PolicyEvent) -> None:
-        if event.event_type in ("policy_updated", "entity_updated"):
-            if event.app_id:
-                logger.info(f"Invalidating cache for app {event.app_id}")
-                cache.invalidate_app(event.app_id)
-            else:
-                logger.info("Invalidating entire cache")
-                cache.invalidate_all()
-    
-    return handler
-
+    return _CacheInvalidator(cache, coalesce_ms)
@@ -0,0 +1,72 @@
+"""
+Shared pytest fixtures for the REST permission tests.
+
+test_rest_entitlements.py and test_permissions_debug.py can be run with
+pytest (optionally in parallel with pytest-xdist, ``pytest -n auto``). The
+HTTP session and the app lookup are built once per test session (per
+worker under xdist) instead of once per script.
+"""
+import json
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+# Parse response bodies with orjson when installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Base URL for the REST API (default port 8080)
+BASE_URL = "http://localhost:8080"
+API_KEY = "dev-secret-key"
+HEADERS = {"X-API-Key": API_KEY}
+
+# (connect, read) seconds for every request, so a stalled server fails the
+# test instead of hanging the worker
+TIMEOUT = (2, 5)
+
+# Scripts with their own runners (argparse presets, live progress output,
+# gRPC stubs); they are run directly by run.sh, not collected
+collect_ignore = [
+    "test_authorize_cache.py",
+    "test_entitlements.py",
+    "test_load_balancing.py",
+    "test_mcp_integration.py",
+]
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize a "principal" argument over the module's PRINCIPALS."""
+    principals = getattr(metafunc.module, "PRINCIPALS", None)
+    if "principal" in metafunc.fixturenames and principals:
+        metafunc.parametrize(
+            "principal", principals, ids=[f"{t}::{i}" for t, i in principals]
+        )
+
+
+@pytest.fixture(scope="session")
+def http():
+    """Keep-alive session shared by every test, with the API key set."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_maxsize=16)
+    session.mount("http://", adapter)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def app_id(http):
+    """ID of the first application; skips the tests if none are seeded."""
+    try:
+        resp = http.get(f"{BASE_URL}/v1/apps/", timeout=TIMEOUT)
+    except requests.Timeout:
+        pytest.fail("server too slow")
+    if resp.status_code != 200:
+        pytest.fail(f"Failed to list apps: {resp.status_code} {resp.text}")
+    
+    apps = _json_loads(resp.content)
+    if not apps:
+        pytest.skip("No applications found. Please run seed script first.")
+    return apps[0]["id"]
@@ -22,6 +22,9 @@ python test_entitlements.py
 echo "Running REST tests..."
 python test_rest_entitlements.py
 
+echo "Running Permissions Debug tests..."
+python -m pytest -q test_permissions_debug.py
+
 echo "Running Cache Validation tests..."
 python test_authorize_cache.py
 
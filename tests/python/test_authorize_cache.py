@@ -1,14 +1,31 @@
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# Parse response bodies with orjson when installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 BASE_URL = "http://localhost:8080"
 
+# Concurrent requests per phase; the session pool holds one connection each
+WORKERS = 4
+
+# Shared keep-alive session so latencies measure the request, not TCP connects
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=WORKERS))
+
 def get_app_id():
     try:
-        resp = requests.get(f"{BASE_URL}/v1/apps/")
-        if resp.ok and resp.json():
-            return resp.json()[0]['id']
+        resp = SESSION.get(f"{BASE_URL}/v1/apps/")
+        if resp.ok:
+            apps = _json_loads(resp.content)
+            if apps:
+                return apps[0]['id']
     except:
         pass
     return 1
@@ -30,11 +47,16 @@ def test_authorize_cache(app_id=None, principal_id="alice", action_id="view", re
 
     print(f"\n--- Testing Cache Invalidation Flow ---")
     
-    # Phase 1: Warm up and verify L1
+    # Open the pooled connection first (without touching the authz cache)
+    # so "Warm-up 1" is not inflated by TCP connect time
+    try:
+        SESSION.get(f"{BASE_URL}/health")
+    except Exception:
+        pass
+    
+    # Phase 1: Warm up and verify L1 (concurrent, like real first traffic)
     print("\n[Phase 1] Warming Cache...")
-    for i in range(1, 4):
-        make_auth_request(auth_url, payload, f"Warm-up {i}")
-        time.sleep(0.1)
+    make_concurrent_auth_requests(auth_url, payload, "Warm-up")
 
     # Phase 2: Update Policy to trigger invalidation
     print("\n[Phase 2] Updating Policy (Triggering Invalidation)...")
@@ -48,10 +70,10 @@ def test_authorize_cache(app_id=None, principal_id="alice", action_id="view", re
     
     policy_id = None
     try:
-        resp = requests.post(create_policy_url, json=policy_payload)
+        resp = SESSION.post(create_policy_url, json=policy_payload)
         if resp.status_code == 200:
             print(" -> Policy updated successfully. Cache should be invalidated.")
-            policy_id = resp.json().get("policy_id")
+            policy_id = _json_loads(resp.content).get("policy_id")
         else:
             print(f" -> Policy update failed: {resp.status_code} {resp.text}")
     except Exception as e:
@@ -59,16 +81,14 @@ def test_authorize_cache(app_id=None, principal_id="alice", action_id="view", re
 
     # Phase 3: Verify Cache Miss (DB Hit) then Re-warm (L1)
     print("\n[Phase 3] Verifying Invalidation & Re-warming...")
-    for i in range(1, 4):
-        make_auth_request(auth_url, payload, f"Post-Update {i}")
-        time.sleep(0.1)
+    make_concurrent_auth_requests(auth_url, payload, "Post-Update")
 
     # Cleanup
     if policy_id:
         print(f"\n[Cleanup] Deleting test policy {policy_id}...")
         del_url = f"{BASE_URL}/v1/apps/{app_id}/policies/{policy_id}"
         try:
-            del_resp = requests.delete(del_url)
+            del_resp = SESSION.delete(del_url)
             if del_resp.status_code == 200:
                 print(" -> Policy deleted successfully.")
             else:
@@ -76,11 +96,15 @@ def test_authorize_cache(app_id=None, principal_id="alice", action_id="view", re
         except Exception as e:
             print(f" -> Delete failed with exception: {e}")
 
+def make_concurrent_auth_requests(url, payload, label, count=3):
+    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
+        list(ex.map(lambda i: make_auth_request(url, payload, f"{label} {i}"), range(1, count + 1)))
+
 def make_auth_request(url, payload, label):
     try:
-        start_time = time.time()
-        response = requests.post(url, json=payload)
-        latency = (time.time() - start_time) * 1000 # ms
+        start_ns = time.perf_counter_ns()
+        response = SESSION.post(url, json=payload)
+        latency = (time.perf_counter_ns() - start_ns) / 1e6 # ms
         
         if response.status_code == 200:
             cache_source = response.headers.get("X-Cedar-Cache", "Unknown")
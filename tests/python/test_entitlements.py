@@ -8,9 +8,39 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import authz_pb2
 import authz_pb2_grpc
 
-def get_entitlements(app_id, principal_type, principal_id, action_type, action_id, resource_type):
+# One channel for every call, so requests multiplex over a single HTTP/2
+# connection instead of paying a connect + handshake each time
+# Assuming the server is running locally on port 50051 as per README
+CHANNEL = grpc.insecure_channel(
+    'localhost:50051',
+    options=[('grpc.keepalive_time_ms', 30000)]
+)
+STUB = authz_pb2_grpc.AuthorizationServiceStub(CHANNEL)
+
+# Entity messages reused across requests (copied in, never mutated)
+_ENTITY_CACHE = {}
+
+def entity(entity_type, entity_id):
+    key = (entity_type, entity_id)
+    cached = _ENTITY_CACHE.get(key)
+    if cached is None:
+        cached = _ENTITY_CACHE[key] = authz_pb2.Entity(type=entity_type, id=entity_id)
+    return cached
+
+def build_request(app_id, principal_type, principal_id, action_type, action_id, resource_type):
+    """Builds a LookupResourcesRequest for the given principal/action/resource type."""
+    # No context: leave the map unset instead of copying in a {} literal
+    request = authz_pb2.LookupResourcesRequest(
+        application_id=app_id,
+        resource_type=resource_type,
+    )
+    request.principal.CopyFrom(entity(principal_type, principal_id))
+    request.action.CopyFrom(entity(action_type, action_id))
+    return request
+
+def report_entitlements(future, app_id, principal_type, principal_id, action_type, action_id, resource_type):
     """
-    Calls LookupResources to find which resources of a given type the principal can access.
+    Waits for a LookupResources future and prints the resources the principal can access.
     """
     print(f"\n--- Requesting Entitlements ---")
     print(f"App ID: {app_id}")
@@ -19,29 +49,14 @@ def get_entitlements(app_id, principal_type, principal_id, action_type, action_i
     print(f"Target Resource Type: {resource_type}")
 
     try:
-        # Connect to the gRPC server
-        # Assuming the server is running locally on port 50051 as per README
-        with grpc.insecure_channel('localhost:50051') as channel:
-            stub = authz_pb2_grpc.AuthorizationServiceStub(channel)
-            
-            # Construct the request
-            request = authz_pb2.LookupResourcesRequest(
-                application_id=app_id,
-                principal=authz_pb2.Entity(type=principal_type, id=principal_id),
-                action=authz_pb2.Entity(type=action_type, id=action_id),
-                resource_type=resource_type,
-                context={} 
-            )
-            
-            # Make the RPC call
-            response = stub.LookupResources(request)
+        response = future.result()
+        
+        # Print results
+        print(f"Result: Found {len(response.resource_ids)} resources")
+        for res_id in response.resource_ids:
+            print(f" - {res_id}")
             
-            # Print results
-            print(f"Result: Found {len(response.resource_ids)} resources")
-            for res_id in response.resource_ids:
-                print(f" - {res_id}")
-                
-            return response.resource_ids
+        return response.resource_ids
 
     except grpc.RpcError as e:
         print(f"RPC Error: {e.code()} - {e.details()}")
@@ -50,36 +65,57 @@ def get_entitlements(app_id, principal_type, principal_id, action_type, action_i
         print(f"Error: {e}")
         return None
 
-if __name__ == '__main__':
-    # specific examples based on potential real usage
-    
-    # 1. Check what Documents alice can view
-    get_entitlements(
-        app_id="1",
-        principal_type="User",
-        principal_id="alice",
-        action_type="Action",
-        action_id="view",
-        resource_type="Document"
-    )
-
-    # 2. Check what Documents bob can view (assuming another user)
-    get_entitlements(
-        app_id="1",
-        principal_type="User",
-        principal_id="bob",
-        action_type="Action",
-        action_id="view",
-        resource_type="Document"
+def get_entitlements(stub, app_id, principal_type, principal_id, action_type, action_id, resource_type):
+    """
+    Calls LookupResources to find which resources of a given type the principal can access.
+    """
+    query = dict(
+        app_id=app_id, principal_type=principal_type, principal_id=principal_id,
+        action_type=action_type, action_id=action_id, resource_type=resource_type
     )
+    return report_entitlements(stub.LookupResources.future(build_request(**query)), **query)
 
-    # 3. Check for a Group (if supported by policy logic)
-    get_entitlements(
-        app_id="1",
-        principal_type="Group",
-        principal_id="admins",
-        action_type="Action",
-        action_id="edit",
-        resource_type="Document"
-    )
+def get_entitlements_concurrently(stub, queries):
+    """
+    Issues all LookupResources calls at once over the shared channel, then
+    reports them in order, so the batch takes about one round trip.
+    """
+    futures = [stub.LookupResources.future(build_request(**q)) for q in queries]
+    return [report_entitlements(f, **q) for f, q in zip(futures, queries)]
 
+if __name__ == '__main__':
+    try:
+        # specific examples based on potential real usage
+        queries = [
+            # 1. Check what Documents alice can view
+            dict(
+                app_id="1",
+                principal_type="User",
+                principal_id="alice",
+                action_type="Action",
+                action_id="view",
+                resource_type="Document"
+            ),
+            # 2. Check what Documents bob can view (assuming another user)
+            dict(
+                app_id="1",
+                principal_type="User",
+                principal_id="bob",
+                action_type="Action",
+                action_id="view",
+                resource_type="Document"
+            ),
+            # 3. Check for a Group (if supported by policy logic)
+            dict(
+                app_id="1",
+                principal_type="Group",
+                principal_id="admins",
+                action_type="Action",
+                action_id="edit",
+                resource_type="Document"
+            ),
+        ]
+        
+        get_entitlements_concurrently(STUB, queries)
+    finally:
+        CHANNEL.close()
@@ -8,12 +8,37 @@ Test script for load balancing and high availability features:
 """
 
 import argparse
+import asyncio
+import atexit
+import functools
+import io
 import json
+import random
 import requests
+import statistics
 import sys
+import threading
 import time
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from requests.adapters import HTTPAdapter
+
+# Use orjson for request/response bodies when installed; it parses the
+# raw response bytes without an intermediate str decode
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# Stream /v1/cluster/instances with ijson when installed, so large clusters
+# are decoded one instance at a time
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Default to load balancer port (nginx)
 BASE_URL = "http://localhost:5173/api"
@@ -21,30 +46,120 @@ DIRECT_API_URL = "http://localhost:8080"
 
 # Rate limit handling
 MAX_RETRIES = 15
-RETRY_DELAY = 1.0  # seconds
+RETRY_DELAY = 1.0  # seconds, base delay when no Retry-After is given
+RETRY_MAX_DELAY = 8.0  # seconds, cap on the exponential backoff
+
+# Keep-alive connection pool shared by every request (429/connection
+# retries are handled by request_with_retry, not the adapter)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# Distribution requests sent when the registry reports a single instance:
+# enough to sanity-check the endpoint, as there is nothing to balance
+SINGLE_INSTANCE_REQUESTS = 5
+
+# In-flight requests for the distribution and authorization tests; kept
+# well below the server's rate limit (429s are still retried by
+# request_with_retry)
+LB_CONCURRENCY = 10
+
+# Abort the authorization test early once more than AUTH_ABORT_ERROR_RATE
+# of the completed requests have failed, checked every AUTH_ABORT_CHECK_EVERY
+# results, so an unhealthy cluster doesn't eat the full request budget
+AUTH_ABORT_CHECK_EVERY = 10
+AUTH_ABORT_ERROR_RATE = 0.5
+
+# Threaded health checks are paced by a token bucket (checks/s, burst) to
+# reduce rate limit hits. The wait for results is bounded by the pacing
+# time plus HEALTH_DEADLINE_S, so a hung instance cannot stall the test;
+# checks still outstanding then count as timeouts. Each request (including
+# the direct-API fallback) times out at that deadline, or after
+# HEALTH_TIMEOUT_S if sooner, so stragglers free their workers with it.
+HEALTH_RATE = 50.0
+HEALTH_BURST = 5
+HEALTH_TIMEOUT_S = 5
+HEALTH_WORKERS = 5
+HEALTH_DEADLINE_S = 0.5
+
+# Pacing for the asyncio load generator (requests/s, burst), so a high
+# --async-concurrency does not simply trip the server's rate limiter. 429s
+# are retried with the same backoff as request_with_retry.
+ASYNC_RATE = 50.0
+ASYNC_BURST = 10
+
+# Worker pool for the threaded health checks, kept for the whole run so
+# repeated invocations reuse its threads (they are started on demand)
+_HEALTH_POOL = ThreadPoolExecutor(max_workers=HEALTH_WORKERS, thread_name_prefix="hc")
+atexit.register(functools.partial(_HEALTH_POOL.shutdown, wait=False))
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Forces a new connection per request, so keep-alive does not pin a client
+# to one backend
+CLOSE_HEADERS = {"Connection": "close"}
+
+# Monotonic clock for request latencies, bound once for the hot paths
+_now_ns = time.perf_counter_ns
+
+
+def resp_json(resp):
+    """Decode a response body as JSON (equivalent to resp.json())."""
+    return _json_loads(resp.content)
+
+
+# Per-thread RNG for retry jitter, so workers don't share (and contend
+# on) the module-level random state
+_RETRY_RNG = threading.local()
+
+
+def _backoff_delay(base, attempt, retry_after=None):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)].
+    
+    The cap (RETRY_MAX_DELAY) applies after jitter, so no delay exceeds it.
+    Jitter spreads out workers that were rate limited at the same moment so
+    they don't all retry together. A server Retry-After is a floor.
+    """
+    rng = getattr(_RETRY_RNG, "rng", None)
+    if rng is None:
+        rng = _RETRY_RNG.rng = random.Random()
+    delay = rng.uniform(0, min(RETRY_MAX_DELAY, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(retry_after, delay)
+    return delay
 
 
 def request_with_retry(method, url, **kwargs):
-    """Make HTTP request with automatic retry on rate limit (429)."""
+    """Make HTTP request with automatic retry on rate limit (429) and read timeouts."""
     kwargs.setdefault("timeout", 10)
     
     for attempt in range(MAX_RETRIES):
         try:
             if method == "GET":
-                resp = requests.get(url, **kwargs)
+                resp = SESSION.get(url, **kwargs)
             elif method == "POST":
-                resp = requests.post(url, **kwargs)
+                resp = SESSION.post(url, **kwargs)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
             if resp.status_code == 429:
                 # Rate limited - wait and retry
-                retry_after = float(resp.headers.get("Retry-After", RETRY_DELAY))
+                retry_after = resp.headers.get("Retry-After")
                 if attempt < MAX_RETRIES - 1:
-                    time.sleep(retry_after)
+                    resp.close()  # release the connection of a stream=True response
+                    time.sleep(_backoff_delay(
+                        RETRY_DELAY, attempt,
+                        float(retry_after) if retry_after is not None else None
+                    ))
                     continue
             
             return resp
+        except requests.exceptions.ReadTimeout:
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(_backoff_delay(RETRY_DELAY, attempt))
+                continue
+            raise
         except requests.exceptions.ConnectionError:
             if attempt < MAX_RETRIES - 1:
                 time.sleep(RETRY_DELAY)
@@ -54,25 +169,257 @@ def request_with_retry(method, url, **kwargs):
     return resp  # Return last response even if rate limited
 
 
-def test_cluster_instances():
-    """Test the /v1/cluster/instances endpoint returns all registered instances."""
-    print("\n=== Testing /v1/cluster/instances Endpoint ===")
+async def _drive(url, n, concurrency, headers=None):
+    """Issue n GETs to url from concurrency worker coroutines.
+    
+    Requests are paced by a TokenBucket(ASYNC_RATE, ASYNC_BURST), and 429s
+    and read timeouts are retried up to MAX_RETRIES times with
+    _backoff_delay, as in request_with_retry.
+    
+    Returns one (start_ns, status_code, body, latency_ms, error) tuple per
+    request, in request order. status_code and body are None if the
+    request failed; body is the decoded JSON of 200 responses. Latency
+    covers the final attempt only.
+    """
+    import httpx
+    
+    records = [None] * n
+    queue = asyncio.Queue()
+    for i in range(n):
+        queue.put_nowait(i)
+    limiter = TokenBucket(ASYNC_RATE, ASYNC_BURST)
+    
+    async def get_with_retry(client):
+        """GET url, retrying like request_with_retry; returns (start_ns, resp)."""
+        for attempt in range(MAX_RETRIES):
+            await limiter.acquire_async()
+            start = _now_ns()
+            try:
+                resp = await client.get(url)
+            except httpx.ReadTimeout:
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(_backoff_delay(RETRY_DELAY, attempt))
+                    continue
+                raise
+            if resp.status_code == 429 and attempt < MAX_RETRIES - 1:
+                retry_after = resp.headers.get("Retry-After")
+                await asyncio.sleep(_backoff_delay(
+                    RETRY_DELAY, attempt,
+                    float(retry_after) if retry_after is not None else None
+                ))
+                continue
+            return start, resp
+    
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=5.0, headers=headers) as client:
+        async def worker():
+            # Single-threaded loop: nothing runs between empty() and get_nowait()
+            while not queue.empty():
+                i = queue.get_nowait()
+                start = _now_ns()
+                try:
+                    start, resp = await get_with_retry(client)
+                    body = _json_loads(resp.content) if resp.status_code == 200 else None
+                    latency = (_now_ns() - start) / 1_000_000
+                    records[i] = (start, resp.status_code, body, latency, None)
+                except httpx.TimeoutException:
+                    records[i] = (start, None, None, None, "Timeout")
+                except (httpx.HTTPError, ValueError) as e:
+                    records[i] = (start, None, None, None, str(e) or type(e).__name__)
+        
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, n))))
+    
+    return records
+
+
+def run_async_load(url, n, concurrency, headers=None):
+    """Run _drive() to completion and report the offered load.
+    
+    Returns None, after printing why, if httpx is not installed, so
+    callers can fall back to the threaded path.
+    """
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("  ⚠ httpx not installed, using the threaded load generator")
+        return None
+    
+    print(f"  Driving {n} requests from {concurrency} async workers...")
+    start = time.perf_counter()
+    records = asyncio.run(_drive(url, n, concurrency, headers))
+    elapsed = time.perf_counter() - start
+    print(f"    Completed in {elapsed:.2f}s ({n / elapsed:.0f} req/s)")
+    return records
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available.
+    
+    Tokens refill continuously at rate per second up to burst. A caller that
+    finds the bucket empty reserves the next token and sleeps outside the
+    lock, so waiting callers are released in order, one every 1/rate s.
+    acquire_async() is the same for coroutines.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token; return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class _ThreadStdout:
+    """sys.stdout proxy that diverts writes from threads with a buffer set."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self._stream).write(text)
     
+    def flush(self):
+        self._stream.flush()
+
+
+def run_concurrently(*calls):
+    """Run zero-argument callables in parallel threads; return their results in order.
+    
+    Each call's output is buffered and replayed in call order afterwards,
+    so the report reads as if the tests had run one after another. An
+    exception from a call is re-raised after all output is replayed.
+    """
+    real_stdout = sys.stdout
+    proxy = _ThreadStdout(real_stdout)
+    
+    def run(call):
+        proxy.local.buffer = buffer = io.StringIO()
+        try:
+            return call(), None, buffer
+        except Exception as e:
+            return None, e, buffer
+        finally:
+            proxy.local.buffer = None
+    
+    sys.stdout = proxy
     try:
-        resp = request_with_retry("GET", f"{BASE_URL}/v1/cluster/instances")
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            outcomes = list(executor.map(run, calls))
+    finally:
+        sys.stdout = real_stdout
+    
+    for _, _, buffer in outcomes:
+        real_stdout.write(buffer.getvalue())
+    for _, error, _ in outcomes:
+        if error is not None:
+            raise error
+    return [result for result, _, _ in outcomes]
+
+
+def print_latency_stats(latencies):
+    """Print min/avg/percentiles/max for latencies in ms; None slots are skipped."""
+    latencies = sorted(x for x in latencies if x is not None)
+    if not latencies:
+        return
+    print(f"\n  Latency (ms):")
+    print(f"    Min: {latencies[0]:.1f}")
+    print(f"    Avg: {statistics.fmean(latencies):.1f}")
+    if len(latencies) >= 2:
+        # quantiles() needs two samples; "inclusive" keeps the
+        # percentiles within the observed min/max
+        pcts = statistics.quantiles(latencies, n=100, method="inclusive")
+        print(f"    P50: {pcts[49]:.1f}")
+        print(f"    P95: {pcts[94]:.1f}")
+        print(f"    P99: {pcts[98]:.1f}")
+    print(f"    Max: {latencies[-1]:.1f}")
+
+
+# Fields of each /v1/cluster/instances entry that the tests read
+_INSTANCE_FIELDS = ("instance_id", "status", "uptime", "cedar_version", "checks", "sse_clients")
+
+
+def fetch_cluster_instances():
+    """GET /v1/cluster/instances, falling back to the direct API.
+    
+    Returns (resp, instances, total); instances is None if the request
+    failed. With ijson installed the body is streamed and each instance is
+    reduced to _INSTANCE_FIELDS, and total is the number of instances read.
+    """
+    stream = ijson is not None
+    try:
+        resp = request_with_retry("GET", f"{BASE_URL}/v1/cluster/instances", stream=stream)
     except requests.exceptions.ConnectionError:
         # Fallback to direct API if load balancer not running
         print("  Load balancer not available, using direct API...")
-        resp = request_with_retry("GET", f"{DIRECT_API_URL}/v1/cluster/instances")
+        resp = request_with_retry("GET", f"{DIRECT_API_URL}/v1/cluster/instances", stream=stream)
+    
+    # Close on every path so a streamed response never holds its connection
+    with resp:
+        if not resp.ok:
+            resp.content  # read the body so resp.text works after close
+            return resp, None, 0
+        
+        if not stream:
+            data = resp_json(resp)
+            return resp, data.get("instances", []), data.get("total", 0)
+        
+        resp.raw.decode_content = True  # undo any Content-Encoding
+        instances = [
+            {k: inst[k] for k in _INSTANCE_FIELDS if k in inst}
+            for inst in ijson.items(resp.raw, "instances.item")
+        ]
+    return resp, instances, len(instances)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_first_app():
+    """Return (app_id, app_name) of the first app, or None if there are none.
+    
+    Tries the load balancer first and falls back to the direct API. The
+    app list does not change during a run, so it is fetched only once.
+    """
+    try:
+        apps_resp = request_with_retry("GET", f"{BASE_URL}/v1/apps/")
+    except requests.exceptions.ConnectionError:
+        apps_resp = request_with_retry("GET", f"{DIRECT_API_URL}/v1/apps/")
     
-    if not resp.ok:
+    apps = resp_json(apps_resp) if apps_resp.ok else None
+    if not apps:
+        return None
+    app = apps[0]
+    return app["id"], app["name"]
+
+
+def test_cluster_instances():
+    """Test the /v1/cluster/instances endpoint returns all registered instances."""
+    print("\n=== Testing /v1/cluster/instances Endpoint ===")
+    
+    resp, instances, total = fetch_cluster_instances()
+    if instances is None:
         print(f"  ✗ Failed to get cluster instances: {resp.status_code} - {resp.text}")
         return False, []
     
-    data = resp.json()
-    instances = data.get("instances", [])
-    total = data.get("total", 0)
-    
     print(f"  Total instances registered: {total}")
     
     if total == 0:
@@ -105,10 +452,23 @@ def test_cluster_instances():
     return True, instances
 
 
-def test_load_balancing_distribution(num_requests=30):
-    """Test that requests are distributed across multiple instances."""
+def test_load_balancing_distribution(num_requests=30, async_concurrency=0, instances=None):
+    """Test that requests are distributed across multiple instances.
+    
+    With async_concurrency > 0 (and httpx installed) the requests come from
+    the asyncio load generator instead of the thread pool, paced at
+    ASYNC_RATE instead of the per-request delay, with the same 429 retries.
+    
+    instances is the list from test_cluster_instances; if it holds a single
+    instance only SINGLE_INSTANCE_REQUESTS requests are sent.
+    """
     print(f"\n=== Testing Load Balancing Distribution ({num_requests} requests) ===")
     
+    if instances and len(instances) == 1 and num_requests > SINGLE_INSTANCE_REQUESTS:
+        print(f"  Only 1 instance registered (load balancing not active), "
+              f"sending {SINGLE_INSTANCE_REQUESTS} requests instead")
+        num_requests = SINGLE_INSTANCE_REQUESTS
+    
     instance_hits = Counter()
     errors = []
     
@@ -118,10 +478,10 @@ def test_load_balancing_distribution(num_requests=30):
             # Add small delay to avoid rate limiting
             time.sleep(0.05)
             # Force connection close to prevent Keep-Alive stickiness in tests
-            headers = {"Connection": "close"}
-            resp = request_with_retry("GET", f"{BASE_URL}/v1/cluster/status", headers=headers, timeout=5)
+            # (the only place the pooled connections are deliberately not reused)
+            resp = request_with_retry("GET", f"{BASE_URL}/v1/cluster/status", headers=CLOSE_HEADERS, timeout=5)
             if resp.ok:
-                data = resp.json()
+                data = resp_json(resp)
                 return data.get("instance_id"), None
             elif resp.status_code == 429:
                 return None, f"Request {i}: Rate limited"
@@ -132,26 +492,48 @@ def test_load_balancing_distribution(num_requests=30):
             try:
                 resp = request_with_retry("GET", f"{DIRECT_API_URL}/v1/cluster/status", timeout=5)
                 if resp.ok:
-                    return resp.json().get("instance_id"), None
+                    return resp_json(resp).get("instance_id"), None
             except:
                 pass
             return None, f"Request {i}: Connection error"
         except Exception as e:
             return None, f"Request {i}: {str(e)}"
     
-    print(f"  Making {num_requests} requests (with rate limit handling)...")
-    
-    # Make requests sequentially to avoid rate limiting
-    for i in range(num_requests):
-        instance_id, error = make_request(i)
-        if instance_id:
-            instance_hits[instance_id] += 1
-        elif error:
-            errors.append(error)
+    records = None
+    if async_concurrency:
+        # Connection: close for the same reason as make_request
+        records = run_async_load(
+            f"{BASE_URL}/v1/cluster/status", num_requests, async_concurrency,
+            headers=CLOSE_HEADERS
+        )
+    
+    if records is not None:
+        for i, (_, status, body, _, error) in enumerate(records):
+            if status == 200 and body.get("instance_id"):
+                instance_hits[body["instance_id"]] += 1
+            elif status == 429:
+                errors.append(f"Request {i}: Rate limited")
+            elif status is not None:
+                errors.append(f"Request {i}: HTTP {status}")
+            else:
+                errors.append(f"Request {i}: {error}")
+        print_latency_stats([r[3] for r in records])
+    else:
+        print(f"  Making {num_requests} requests, {LB_CONCURRENCY} at a time (with rate limit handling)...")
         
-        # Progress indicator every 10 requests
-        if (i + 1) % 10 == 0:
-            print(f"    Progress: {i + 1}/{num_requests}")
+        # Bounded concurrency: the pool size caps in-flight requests
+        with ThreadPoolExecutor(max_workers=LB_CONCURRENCY) as executor:
+            futures = [executor.submit(make_request, i) for i in range(num_requests)]
+            for done, future in enumerate(as_completed(futures), start=1):
+                instance_id, error = future.result()
+                if instance_id:
+                    instance_hits[instance_id] += 1
+                elif error:
+                    errors.append(error)
+                
+                # Progress indicator every 10 requests
+                if done % 10 == 0:
+                    print(f"    Progress: {done}/{num_requests}")
     
     # Report results
     print(f"\n  Results:")
@@ -165,7 +547,7 @@ def test_load_balancing_distribution(num_requests=30):
     
     print(f"\n  Distribution across instances:")
     total_hits = sum(instance_hits.values())
-    for instance_id, count in sorted(instance_hits.items(), key=lambda x: -x[1]):
+    for instance_id, count in instance_hits.most_common():
         percentage = (count / total_hits * 100) if total_hits > 0 else 0
         bar = "█" * int(percentage / 5) + "░" * (20 - int(percentage / 5))
         print(f"    {instance_id}: {count:3d} ({percentage:5.1f}%) {bar}")
@@ -190,22 +572,40 @@ def test_load_balancing_distribution(num_requests=30):
             return True
 
 
-def test_concurrent_health_checks(num_checks=10):
-    """Test health endpoint under concurrent load."""
+def test_concurrent_health_checks(num_checks=10, async_concurrency=0):
+    """Test health endpoint under concurrent load.
+    
+    With async_concurrency > 0 (and httpx installed) the checks come from
+    the asyncio load generator, paced at ASYNC_RATE, with 429 retries and
+    no deadline.
+    """
     print(f"\n=== Testing Concurrent Health Checks ({num_checks} parallel) ===")
     
-    results = {"healthy": 0, "degraded": 0, "error": 0, "timeout": 0, "rate_limited": 0}
-    latencies = []
+    results = Counter()
+    # One slot per check, filled by index; checks without a latency stay None
+    latencies = [None] * num_checks
+    
+    limiter = TokenBucket(HEALTH_RATE, HEALTH_BURST)
+    pacing = max(0, num_checks - HEALTH_BURST) / HEALTH_RATE
+    deadline_at = time.monotonic() + pacing + HEALTH_DEADLINE_S
+    
+    def time_left():
+        """Request timeout that ends no later than the overall deadline."""
+        return min(HEALTH_TIMEOUT_S, deadline_at - time.monotonic())
     
     def check_health(i):
-        start = time.time()
+        # Wait for a token before starting the clock, so pacing is not
+        # counted as server latency
+        limiter.acquire()
+        start = _now_ns()
+        timeout = time_left()
+        if timeout <= 0:
+            return "timeout", None, "Timeout"
         try:
-            # Small stagger to reduce rate limit hits
-            time.sleep(i * 0.02)
-            resp = requests.get(f"{BASE_URL}/health", timeout=5)
-            latency = (time.time() - start) * 1000  # ms
+            resp = SESSION.get(f"{BASE_URL}/health", timeout=timeout)
+            latency = (_now_ns() - start) / 1_000_000  # ms
             if resp.ok:
-                status = resp.json().get("status", "unknown")
+                status = resp_json(resp).get("status", "unknown")
                 return status, latency, None
             elif resp.status_code == 429:
                 return "rate_limited", latency, "Rate limited"
@@ -214,50 +614,65 @@ def test_concurrent_health_checks(num_checks=10):
         except requests.exceptions.Timeout:
             return "timeout", None, "Timeout"
         except requests.exceptions.ConnectionError:
-            # Try direct API
+            # Try direct API, within what is left of the deadline
             try:
-                resp = requests.get(f"{DIRECT_API_URL}/health", timeout=5)
-                latency = (time.time() - start) * 1000
+                timeout = time_left()
+                if timeout <= 0:
+                    return "timeout", None, "Timeout"
+                resp = SESSION.get(f"{DIRECT_API_URL}/health", timeout=timeout)
+                latency = (_now_ns() - start) / 1_000_000
                 if resp.ok:
-                    return resp.json().get("status", "unknown"), latency, None
+                    return resp_json(resp).get("status", "unknown"), latency, None
             except:
                 pass
             return "error", None, "Connection error"
         except Exception as e:
             return "error", None, str(e)
     
-    print(f"  Running {num_checks} health checks (staggered to avoid rate limits)...")
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:  # Reduced concurrency
-        futures = [executor.submit(check_health, i) for i in range(num_checks)]
-        for future in as_completed(futures):
+    records = None
+    if async_concurrency:
+        records = run_async_load(f"{BASE_URL}/health", num_checks, async_concurrency)
+    
+    if records is not None:
+        for i, (_, status, body, latency, error) in enumerate(records):
+            latencies[i] = latency
+            if status == 200:
+                results[body.get("status", "unknown")] += 1
+            elif status == 429:
+                results["rate_limited"] += 1
+            elif status is None and error == "Timeout":
+                results["timeout"] += 1
+            else:
+                results["error"] += 1
+    else:
+        print(f"  Running {num_checks} health checks (paced at {HEALTH_RATE:.0f}/s to avoid rate limits)...")
+        
+        futures = {_HEALTH_POOL.submit(check_health, i): i for i in range(num_checks)}
+        done, not_done = wait(futures, timeout=max(0, deadline_at - time.monotonic()))
+        for future in done:
             status, latency, error = future.result()
-            results[status] = results.get(status, 0) + 1
-            if latency is not None:
-                latencies.append(latency)
+            results[status] += 1
+            latencies[futures[future]] = latency
+        # Stragglers count as timeouts; don't wait for them. Queued checks
+        # are cancelled; running ones end at the same deadline.
+        for future in not_done:
+            future.cancel()
+            results["timeout"] += 1
     
     # Report results
     print(f"\n  Results:")
-    for status, count in sorted(results.items(), key=lambda x: -x[1]):
-        if count > 0:
-            icon = "✓" if status == "healthy" else "⚠" if status == "degraded" else "✗"
-            print(f"    {icon} {status}: {count}")
-    
-    if latencies:
-        avg_latency = sum(latencies) / len(latencies)
-        min_latency = min(latencies)
-        max_latency = max(latencies)
-        print(f"\n  Latency (ms):")
-        print(f"    Min: {min_latency:.1f}")
-        print(f"    Avg: {avg_latency:.1f}")
-        print(f"    Max: {max_latency:.1f}")
+    for status, count in results.most_common():
+        icon = "✓" if status == "healthy" else "⚠" if status == "degraded" else "✗"
+        print(f"    {icon} {status}: {count}")
+    
+    print_latency_stats(latencies)
     
     # Pass if majority are healthy (excluding rate limited)
     total = sum(results.values())
-    non_rate_limited = total - results.get("rate_limited", 0)
+    non_rate_limited = total - results["rate_limited"]
     healthy_pct = (results["healthy"] / non_rate_limited * 100) if non_rate_limited > 0 else 0
     
-    if results.get("rate_limited", 0) > 0:
+    if results["rate_limited"] > 0:
         print(f"\n  ⚠ {results['rate_limited']} requests were rate limited")
     
     if healthy_pct >= 90:
@@ -276,44 +691,40 @@ def test_authorization_across_instances(num_requests=20):
     print(f"\n=== Testing Authorization Across Instances ({num_requests} requests) ===")
     
     # First get an app (with retry)
-    try:
-        apps_resp = request_with_retry("GET", f"{BASE_URL}/v1/apps/")
-    except requests.exceptions.ConnectionError:
-        apps_resp = request_with_retry("GET", f"{DIRECT_API_URL}/v1/apps/")
-    
-    if not apps_resp.ok or not apps_resp.json():
+    first_app = _get_first_app()
+    if first_app is None:
         print("  ⚠ No apps found, skipping authorization test")
         return True
     
-    app = apps_resp.json()[0]
-    app_id = app["id"]
-    print(f"  Using app: {app['name']} (ID: {app_id})")
+    app_id, app_name = first_app
+    print(f"  Using app: {app_name} (ID: {app_id})")
     
-    auth_payload = {
+    # Serialized once and posted as-is by every request
+    auth_body = _json_dumps({
         "application_id": app_id,
         "principal": {"type": "User", "id": "alice"},
         "action": {"type": "Action", "id": "view"},
         "resource": {"type": "Document", "id": "test-doc"},
         "context": {}
-    }
+    })
     
-    results = {"allow": 0, "deny": 0, "error": 0}
+    results = Counter()
     instance_hits = Counter()
     
     def make_auth_request(i):
         try:
-            # Small delay to avoid rate limiting
-            time.sleep(0.1)
-            
-            # Make auth request
-            resp = request_with_retry("POST", f"{BASE_URL}/v1/authorize", json=auth_payload, timeout=5)
+            # Make auth request; 429s are throttled via Retry-After
+            resp = request_with_retry("POST", f"{BASE_URL}/v1/authorize", data=auth_body, headers=JSON_HEADERS, timeout=5)
             
-            # Also get instance ID from cluster status
-            status_resp = request_with_retry("GET", f"{BASE_URL}/v1/cluster/status", timeout=5)
-            instance_id = status_resp.json().get("instance_id", "unknown") if status_resp.ok else "unknown"
+            # The serving instance is echoed in X-Instance-Id; older servers
+            # need a separate cluster status call
+            instance_id = resp.headers.get("X-Instance-Id")
+            if not instance_id:
+                status_resp = request_with_retry("GET", f"{BASE_URL}/v1/cluster/status", timeout=5)
+                instance_id = resp_json(status_resp).get("instance_id", "unknown") if status_resp.ok else "unknown"
             
             if resp.ok:
-                decision = resp.json().get("decision", "unknown")
+                decision = resp_json(resp).get("decision", "unknown")
                 return decision, instance_id, None
             elif resp.status_code == 429:
                 return "error", instance_id, "Rate limited"
@@ -321,42 +732,52 @@ def test_authorization_across_instances(num_requests=20):
                 return "error", instance_id, f"HTTP {resp.status_code}"
         except requests.exceptions.ConnectionError:
             try:
-                resp = request_with_retry("POST", f"{DIRECT_API_URL}/v1/authorize", json=auth_payload, timeout=5)
+                resp = request_with_retry("POST", f"{DIRECT_API_URL}/v1/authorize", data=auth_body, headers=JSON_HEADERS, timeout=5)
                 if resp.ok:
-                    return resp.json().get("decision", "unknown"), "direct", None
+                    return resp_json(resp).get("decision", "unknown"), "direct", None
             except:
                 pass
             return "error", "unknown", "Connection error"
         except Exception as e:
             return "error", "unknown", str(e)
     
-    print(f"  Making {num_requests} authorization requests (sequential to avoid rate limits)...")
+    print(f"  Making {num_requests} authorization requests, {LB_CONCURRENCY} at a time...")
     
-    # Run sequentially to avoid rate limiting
-    for i in range(num_requests):
-        decision, instance_id, error = make_auth_request(i)
-        results[decision] = results.get(decision, 0) + 1
-        instance_hits[instance_id] += 1
-        
-        if (i + 1) % 10 == 0:
-            print(f"    Progress: {i + 1}/{num_requests}")
+    completed = 0
+    with ThreadPoolExecutor(max_workers=LB_CONCURRENCY) as executor:
+        futures = [executor.submit(make_auth_request, i) for i in range(num_requests)]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            decision, instance_id, error = future.result()
+            results[decision] += 1
+            instance_hits[instance_id] += 1
+            
+            if completed % 10 == 0:
+                print(f"    Progress: {completed}/{num_requests}")
+            
+            if (completed % AUTH_ABORT_CHECK_EVERY == 0
+                    and results["error"] / completed > AUTH_ABORT_ERROR_RATE):
+                # Drop the queued requests; only the in-flight ones finish
+                for pending in futures:
+                    pending.cancel()
+                print(f"  ⚠ Aborting after {completed}/{num_requests} requests: "
+                      f"{results['error']} errors")
+                break
     
     # Report results
     print(f"\n  Authorization Results:")
-    for decision, count in sorted(results.items(), key=lambda x: -x[1]):
-        if count > 0:
-            icon = "✓" if decision == "allow" else "✗" if decision == "deny" else "⚠"
-            print(f"    {icon} {decision}: {count}")
+    for decision, count in results.most_common():
+        icon = "✓" if decision == "allow" else "✗" if decision == "deny" else "⚠"
+        print(f"    {icon} {decision}: {count}")
     
     print(f"\n  Instance Distribution:")
-    for instance_id, count in sorted(instance_hits.items(), key=lambda x: -x[1]):
+    for instance_id, count in instance_hits.most_common():
         print(f"    {instance_id}: {count}")
     
     # Check consistency - all non-error results should be the same decision
     # Filter out keys with 0 values and error/unknown keys
     non_error_results = {k: v for k, v in results.items() if k not in ("error", "unknown") and v > 0}
     
-    error_rate = results.get("error", 0) / num_requests * 100
+    error_rate = results["error"] / completed * 100 if completed else 100.0
     if error_rate > 10:
         print(f"\n  ⚠ High error rate: {error_rate:.1f}%")
         return error_rate < 50  # Pass if less than 50% errors
@@ -372,20 +793,22 @@ def test_authorization_across_instances(num_requests=20):
     return True
 
 
-def test_sse_per_instance():
-    """Test that SSE client counts are tracked per instance."""
+def test_sse_per_instance(instances=None, refresh=False):
+    """Test that SSE client counts are tracked per instance.
+    
+    Args:
+        instances: Instance list already fetched by test_cluster_instances;
+            fetched here only if empty or None
+        refresh: Refetch /v1/cluster/instances even if instances is given
+    """
     print("\n=== Testing SSE Client Tracking ===")
     
-    try:
-        resp = request_with_retry("GET", f"{BASE_URL}/v1/cluster/instances")
-    except requests.exceptions.ConnectionError:
-        resp = request_with_retry("GET", f"{DIRECT_API_URL}/v1/cluster/instances")
-    
-    if not resp.ok:
-        print(f"  ✗ Failed to get cluster instances: {resp.status_code}")
-        return False
+    if refresh or not instances:
+        resp, instances, _ = fetch_cluster_instances()
+        if instances is None:
+            print(f"  ✗ Failed to get cluster instances: {resp.status_code}")
+            return False
     
-    instances = resp.json().get("instances", [])
     total_sse = sum(i.get("sse_clients", 0) for i in instances)
     
     print(f"  Total SSE clients across cluster: {total_sse}")
@@ -397,6 +820,8 @@ def test_sse_per_instance():
 
 
 def main():
+    global MAX_RETRIES, RETRY_DELAY, RETRY_MAX_DELAY
+    
     parser = argparse.ArgumentParser(
         description="Load Balancing & High Availability Test Suite",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -406,6 +831,7 @@ Examples:
   python test_load_balancing.py -n 200             # 200 load balancing requests
   python test_load_balancing.py -n 500 -c 50       # 500 LB requests, 50 health checks
   python test_load_balancing.py --fast             # Quick test with fewer requests
+  python test_load_balancing.py -n 5000 --async-concurrency 200  # asyncio load generator
         """
     )
     parser.add_argument("-n", "--num-requests", type=int, default=50,
@@ -418,13 +844,32 @@ Examples:
                         help="Quick test with reduced request counts")
     parser.add_argument("--stress", action="store_true",
                         help="Stress test with high request counts (500/100/100)")
+    parser.add_argument("--async-concurrency", type=int, default=0, metavar="N",
+                        help="Drive the distribution and health check tests from an asyncio "
+                             "load generator with N requests in flight (requires httpx; "
+                             "default: 0 = threaded, 100 with --stress)")
+    parser.add_argument("--serial", action="store_true",
+                        help="Run every test one after another (tests 1 and 3 "
+                             "otherwise run concurrently)")
+    parser.add_argument("--max-retries", type=int, default=MAX_RETRIES,
+                        help=f"Attempts per request on 429/read timeout (default: {MAX_RETRIES})")
+    parser.add_argument("--retry-delay", type=float, default=RETRY_DELAY,
+                        help=f"Base retry delay in seconds (default: {RETRY_DELAY})")
+    parser.add_argument("--retry-max-delay", type=float, default=RETRY_MAX_DELAY,
+                        help=f"Cap on the retry backoff in seconds (default: {RETRY_MAX_DELAY})")
     
     args = parser.parse_args()
     
+    # Retry tuning is read by request_with_retry at call time
+    MAX_RETRIES = args.max_retries
+    RETRY_DELAY = args.retry_delay
+    RETRY_MAX_DELAY = args.retry_max_delay
+    
     # Adjust counts based on presets
     num_requests = args.num_requests
     concurrent = args.concurrent
     auth_requests = args.auth_requests
+    async_concurrency = args.async_concurrency
     
     if args.fast:
         num_requests = 10
@@ -434,6 +879,7 @@ Examples:
         num_requests = 500
         concurrent = 100
         auth_requests = 100
+        async_concurrency = async_concurrency or 100
     
     print("=" * 70)
     print("Load Balancing & High Availability Test Suite")
@@ -441,24 +887,31 @@ Examples:
     print(f"API URL: {BASE_URL}")
     print(f"Direct URL: {DIRECT_API_URL}")
     print(f"Config: {num_requests} LB requests, {concurrent} health checks, {auth_requests} auth requests")
+    if async_concurrency:
+        print(f"Async load generator: {async_concurrency} requests in flight")
     
     results = {}
     
-    # Test 1: Cluster instances endpoint
-    passed, instances = test_cluster_instances()
+    # Test 1: Cluster instances endpoint, and
+    # Test 3: Concurrent health checks
+    # Both are read-only and independent, so they run side by side; tests 2
+    # and 4 are rate-limit sensitive and run on their own afterwards
+    run_health = functools.partial(test_concurrent_health_checks, concurrent, async_concurrency)
+    if args.serial:
+        (passed, instances), health_passed = test_cluster_instances(), run_health()
+    else:
+        (passed, instances), health_passed = run_concurrently(test_cluster_instances, run_health)
     results["cluster_instances"] = passed
     
     # Test 2: Load balancing distribution
-    results["load_distribution"] = test_load_balancing_distribution(num_requests)
-    
-    # Test 3: Concurrent health checks
-    results["concurrent_health"] = test_concurrent_health_checks(concurrent)
+    results["load_distribution"] = test_load_balancing_distribution(num_requests, async_concurrency, instances)
+    results["concurrent_health"] = health_passed
     
     # Test 4: Authorization consistency
     results["auth_consistency"] = test_authorization_across_instances(auth_requests)
     
-    # Test 5: SSE tracking
-    results["sse_tracking"] = test_sse_per_instance()
+    # Test 5: SSE tracking (reuses the instance list from test 1)
+    results["sse_tracking"] = test_sse_per_instance(instances)
     
     # Summary
     print("\n" + "=" * 70)
@@ -0,0 +1,136 @@
+"""
+Offline tests for CedarMCPAuthorizer.filter_tools.
+
+The Cedar client is replaced by a stub, so no server is needed:
+
+    pytest test_mcp_authorizer.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from clients.python.mcp.authorizer import CedarMCPAuthorizer, CedarMCPConfig
+
+
+class StubClient:
+    """Answers entitlements from a fixed response and batch checks from a set."""
+    
+    def __init__(self, entitlements, granted=()):
+        self.entitlements = entitlements
+        self.granted = set(granted)
+        self.lookups = []
+        self.batches = []
+        self.principal_types = set()
+    
+    def get_entitlements(self, username, groups=None, include_inherited=True):
+        self.lookups.append(username)
+        return self.entitlements
+    
+    def batch_check(self, checks):
+        self.batches.append([check[2] for check in checks])
+        self.principal_types.update(check[0] for check in checks)
+        return [check[2] in self.granted for check in checks]
+    
+    def close(self):
+        pass
+
+
+def make_authorizer(client, **config):
+    authorizer = CedarMCPAuthorizer(CedarMCPConfig(enable_sse=False, **config))
+    authorizer._client = client
+    return authorizer
+
+
+def permit(actions, **extra):
+    return {"effect": "permit", "actions": actions, "resource_types": ["Tool"], **extra}
+
+
+def test_unconditional_permits_are_still_checked():
+    client = StubClient({"entitlements": [permit(["read_document"])]}, granted={"read_document"})
+    authorizer = make_authorizer(client)
+    
+    tools = [{"name": "read_document"}, {"name": "delete_document"}]
+    assert authorizer.filter_tools(tools, user_id="alice") == [{"name": "read_document"}]
+    # Tools the summary never permits are not sent
+    assert client.batches == [["read_document"]]
+
+
+def test_unless_permit_is_checked():
+    # The backend parser drops "unless" clauses, so
+    # permit(...) unless { ... } arrives as an unconditional permit
+    client = StubClient({"entitlements": [permit(["delete_document"])]})
+    authorizer = make_authorizer(client)
+    
+    assert authorizer.filter_tools([{"name": "delete_document"}], user_id="alice") == []
+    assert client.batches == [["delete_document"]]
+
+
+def test_non_user_principal_skips_entitlements():
+    # /v1/entitlements always answers for a User principal
+    client = StubClient({"entitlements": [permit(["read_document"])]}, granted={"run_query"})
+    authorizer = make_authorizer(client, default_principal_type="Service")
+    
+    tools = [{"name": "read_document"}, {"name": "run_query"}]
+    assert authorizer.filter_tools(tools, user_id="etl") == [{"name": "run_query"}]
+    assert client.lookups == []
+    assert client.batches == [["read_document", "run_query"]]
+    assert client.principal_types == {"Service"}
+
+
+def test_entitlements_memo_is_bounded():
+    client = StubClient({"entitlements": [permit(["read_document"])]})
+    authorizer = make_authorizer(client, cache_max_size=2)
+    
+    for user_id in ("alice", "bob", "carol"):
+        authorizer.filter_tools([{"name": "read_document"}], user_id=user_id)
+    assert list(authorizer._allowed_actions_cache) == ["bob", "carol"]
+
+
+def test_conditional_permit_grants_tool():
+    client = StubClient(
+        {"entitlements": [
+            permit(["read_document"]),
+            permit(["export_report"], conditions='when { context.mfa == true }'),
+        ]},
+        granted={"read_document", "export_report"},
+    )
+    authorizer = make_authorizer(client)
+    
+    tools = [{"name": "read_document"}, {"name": "export_report"}, {"name": "delete_document"}]
+    assert authorizer.filter_tools(tools, user_id="alice") == [
+        {"name": "read_document"}, {"name": "export_report"}
+    ]
+    # A conditional permit may allow any tool, so all of them are checked
+    assert client.batches == [["read_document", "export_report", "delete_document"]]
+
+
+def test_resource_scoped_permit_grants_tool():
+    client = StubClient(
+        {"entitlements": [permit(["run_query"], resource_ids=["run_query"])]},
+        granted={"run_query"},
+    )
+    authorizer = make_authorizer(client)
+    
+    assert authorizer.filter_tools([{"name": "run_query"}], user_id="alice") == [{"name": "run_query"}]
+
+
+def test_forbid_is_left_to_the_check():
+    client = StubClient(
+        {"entitlements": [permit(["read_document"]), {"effect": "forbid", "actions": []}]},
+    )
+    authorizer = make_authorizer(client)
+    
+    assert authorizer.filter_tools([{"name": "read_document"}], user_id="alice") == []
+    assert client.batches == [["read_document"]]
+
+
+def test_mixed_tool_list_keeps_dict_tools():
+    class Tool:
+        name = "read_document"
+    
+    client = StubClient({"entitlements": []}, granted={"read_document", "run_query"})
+    authorizer = make_authorizer(client, default_principal_type="Service")
+    
+    tools = [Tool(), {"name": "run_query"}]
+    assert authorizer.filter_tools(tools, user_id="etl") == tools
@@ -6,28 +6,61 @@ Test script for MCP integration features:
 3. MCP SDK (client-side caching, authorization helpers)
 """
 
+import functools
 import json
-import requests
 import sys
 import threading
 import time
+from collections import defaultdict, deque
+
+# requests (and the SDK in test_mcp_sdk) are imported inside the functions
+# that use them, so importing this module stays cheap
 
 BASE_URL = "http://localhost:8080"
 
+# Events kept per type by the SSE listener
+SSE_EVENTS_PER_TYPE = 1024
+
+# Use orjson for SSE payloads and response bodies when installed; its JSONDecodeError
+# subclasses ValueError like json's
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+@functools.lru_cache(maxsize=1)
+def _get_first_app():
+    """Return (app_id, app_name) of the first app, or None if there are none.
+    
+    The app list does not change during a run, so it is fetched once and
+    shared by every test.
+    """
+    import requests
+    
+    apps_resp = requests.get(f"{BASE_URL}/v1/apps/")
+    if not apps_resp.ok:
+        return None
+    apps = _json_loads(apps_resp.content)
+    if not apps:
+        return None
+    app = apps[0]
+    return app["id"], app["name"]
+
 
 def test_entitlements_endpoint():
     """Test the /v1/entitlements endpoint for IdP integration."""
+    import requests
+    
     print("\n=== Testing /v1/entitlements Endpoint ===")
     
     # First, get an existing app
-    apps_resp = requests.get(f"{BASE_URL}/v1/apps/")
-    if not apps_resp.ok or not apps_resp.json():
+    first_app = _get_first_app()
+    if first_app is None:
         print("No apps found. Please run seed first.")
         return False
     
-    app = apps_resp.json()[0]
-    app_id = app["id"]
-    app_name = app["name"]
+    app_id, app_name = first_app
     print(f"Using app: {app_name} (ID: {app_id})")
     
     # Test 1: Query by application_id
@@ -41,7 +74,7 @@ def test_entitlements_endpoint():
     
     resp = requests.post(f"{BASE_URL}/v1/entitlements", json=payload)
     if resp.ok:
-        data = resp.json()
+        data = _json_loads(resp.content)
         print(f"  ✓ Response received")
         print(f"    Username: {data.get('username')}")
         print(f"    App: {data.get('application_name')} (ID: {data.get('application_id')})")
@@ -93,30 +126,60 @@ def test_entitlements_endpoint():
 
 def test_sse_endpoint():
     """Test the /v1/events SSE endpoint."""
+    import requests
+    
     print("\n=== Testing /v1/events SSE Endpoint ===")
     
-    received_events = []
+    # Recent events indexed by type, so checks look up one type instead of
+    # rescanning everything received; bounded for long sessions
+    events_by_type = defaultdict(lambda: deque(maxlen=SSE_EVENTS_PER_TYPE))
+    received_events_lock = threading.Lock()
+    policy_updated_evt = threading.Event()
     stop_flag = threading.Event()
     
     def listen_sse():
         """Background thread to listen for SSE events."""
         try:
-            with requests.get(
+            # Own session so the stream's connection is separate from the
+            # requests that trigger events
+            with requests.Session() as session, session.get(
                 f"{BASE_URL}/v1/events",
                 headers={"Accept": "text/event-stream"},
                 stream=True,
                 timeout=(5, 10)  # 5s connect, 10s read
             ) as resp:
-                for line in resp.iter_lines(decode_unicode=True):
+                # Split the raw byte stream on blank-line event boundaries
+                # and hand data payloads to the JSON parser as bytes, so
+                # nothing is decoded to str first. SSE lines may end in
+                # CRLF, LF or CR; all are normalized to LF. A chunk ending
+                # in CR may have its LF at the start of the next chunk,
+                # which is then dropped.
+                buf = bytearray()
+                skip_lf = False
+                for chunk in resp.iter_content(chunk_size=8192):
                     if stop_flag.is_set():
                         break
-                    if line and line.startswith("data:"):
-                        data = line[5:].strip()
-                        try:
-                            event = json.loads(data)
-                            received_events.append(event)
-                        except:
-                            pass
+                    if skip_lf and chunk.startswith(b"\n"):
+                        chunk = chunk[1:]
+                    skip_lf = chunk.endswith(b"\r")
+                    buf += chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+                    start = 0
+                    end = buf.find(b"\n\n")
+                    while end != -1:
+                        for line in bytes(buf[start:end]).split(b"\n"):
+                            if line.startswith(b"data:"):
+                                try:
+                                    event = _json_loads(line[5:])
+                                except ValueError:
+                                    continue
+                                event_type = event.get("type", "unknown")
+                                with received_events_lock:
+                                    events_by_type[event_type].append(event)
+                                if event.get("type") == "policy_updated":
+                                    policy_updated_evt.set()
+                        start = end + 2
+                        end = buf.find(b"\n\n", start)
+                    del buf[:start]
         except requests.exceptions.Timeout:
             pass
         except Exception as e:
@@ -131,16 +194,18 @@ def test_sse_endpoint():
     time.sleep(1)
     
     # Check if we received the initial "connected" event
-    if any(e.get("type") == "connected" for e in received_events):
+    with received_events_lock:
+        connected = bool(events_by_type["connected"])
+    if connected:
         print("  ✓ Received 'connected' event")
     else:
         print("  ! No 'connected' event yet (may still be connecting)")
     
     # Trigger a policy update to generate an event
     print("\n[Test 2] Triggering policy update event...")
-    apps_resp = requests.get(f"{BASE_URL}/v1/apps/")
-    if apps_resp.ok and apps_resp.json():
-        app_id = apps_resp.json()[0]["id"]
+    first_app = _get_first_app()
+    if first_app is not None:
+        app_id, _ = first_app
         
         # Create a test policy (then delete it)
         policy_payload = {
@@ -152,15 +217,14 @@ def test_sse_endpoint():
         
         create_resp = requests.post(f"{BASE_URL}/v1/apps/{app_id}/policies", json=policy_payload)
         if create_resp.ok:
-            policy_id = create_resp.json().get("policy_id")
+            policy_id = _json_loads(create_resp.content).get("policy_id")
             print(f"  Created test policy {policy_id}")
             
-            # Wait for event propagation
-            time.sleep(0.5)
-            
-            # Check for policy_updated event
-            policy_events = [e for e in received_events if e.get("type") == "policy_updated"]
-            if policy_events:
+            # Wait for event propagation; returns as soon as the listener
+            # sees the first policy_updated event
+            if policy_updated_evt.wait(timeout=2.0):
+                with received_events_lock:
+                    policy_events = list(events_by_type["policy_updated"])
                 print(f"  ✓ Received {len(policy_events)} policy_updated event(s)")
             else:
                 print("  ! No policy_updated event received (may be timing issue)")
@@ -177,7 +241,9 @@ def test_sse_endpoint():
     stop_flag.set()
     listener_thread.join(timeout=2)
     
-    print(f"\n[Summary] Received {len(received_events)} total events")
+    with received_events_lock:
+        total_events = sum(len(events) for events in events_by_type.values())
+    print(f"\n[Summary] Received {total_events} total events")
     return True
 
 
@@ -0,0 +1,86 @@
+"""
+Offline tests for the SSE event parser's max_event_bytes handling.
+
+No server is needed:
+
+    pytest test_mcp_sse.py
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from clients.python.mcp.sse import SSESubscriber, _EventParser, _EventTooLarge
+
+
+UPDATE = b'event: policy_updated\ndata: {"app_id": 1}\n\n'
+
+
+def test_overflow_keeps_events_completed_in_the_chunk():
+    parser = _EventParser(max_event_bytes=16)
+    
+    with pytest.raises(_EventTooLarge) as excinfo:
+        parser.feed_chunk(UPDATE + b"data: " + b"x" * 32 + b"\n")
+    assert excinfo.value.events == [("policy_updated", b'{"app_id": 1}')]
+    
+    # The parser is reset and keeps working
+    assert parser.feed_chunk(UPDATE) == [("policy_updated", b'{"app_id": 1}')]
+
+
+def test_overflow_across_data_lines_resets_parser():
+    parser = _EventParser(max_event_bytes=16)
+    
+    with pytest.raises(_EventTooLarge) as excinfo:
+        parser.feed_chunk(UPDATE + b"data: 0123456789\ndata: 0123456789\n\n")
+    assert len(excinfo.value.events) == 1
+    assert parser.data is None and not parser._buf
+
+
+def test_overflow_on_unterminated_line():
+    parser = _EventParser(max_event_bytes=16)
+    
+    assert parser.feed_chunk(b"data: 0123") == []
+    with pytest.raises(_EventTooLarge) as excinfo:
+        parser.feed_chunk(b"456789abcdef")
+    assert excinfo.value.events == []
+    assert not parser._buf
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+
+class FakeSession:
+    def __init__(self, chunks):
+        self.chunks = chunks
+    
+    def get(self, url, stream, timeout):
+        return FakeResponse(self.chunks)
+
+
+def test_subscriber_delivers_events_before_reconnecting():
+    received = []
+    subscriber = SSESubscriber(
+        url="http://cedar/v1/events", on_event=received.append, max_event_bytes=16
+    )
+    subscriber._stop_event.clear()
+    subscriber._session = FakeSession([UPDATE + b"data: " + b"x" * 32 + b"\n"])
+    
+    with pytest.raises(ValueError):
+        subscriber._connect_and_listen()
+    assert [(e.event_type, e.app_id) for e in received] == [("policy_updated", 1)]
@@ -1,25 +1,108 @@
 #!/usr/bin/env python3
-import requests
+import argparse
+import atexit
+import collections
+import functools
 import json
+import os
+import requests
+import shelve
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlencode
+from urllib3.util.retry import Retry
+
+# orjson parses and pretty-prints much faster than json when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 # Base URL for the REST API (default port 8080)
 BASE_URL = "http://localhost:8080"
 API_KEY = "dev-secret-key"
+HEADERS = {"X-API-Key": API_KEY}
+
+# URLs built once; the permissions URL is filled in per app
+APPS_URL = f"{BASE_URL}/v1/apps"
+PERMS_URL_TMPL = BASE_URL + "/v1/apps/{}/permissions"
+
+# Principals whose permissions are checked; fetched concurrently
+PRINCIPALS = [("User", "alice"), ("User", "bob")]
+MAX_WORKERS = 8
 
+# (connect, read) seconds for every request, so a stalled server fails the
+# request instead of hanging the run
+TIMEOUT = (2, 5)
+
+# One keep-alive session for every call of a direct run, with the API key
+# set once; under pytest the conftest.py http fixture is passed instead
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+atexit.register(SESSION.close)
+
+# Optional on-disk replay cache for repeat runs against an unchanged
+# backend: PERM_TESTS_CACHE=<file> enables it, and successful responses are
+# replayed for PERM_TESTS_CACHE_TTL seconds (default 60). Off by default so
+# normal runs always hit the server.
+CACHE_PATH = os.environ.get("PERM_TESTS_CACHE")
+CACHE_TTL = float(os.environ.get("PERM_TESTS_CACHE_TTL", "60"))
+
+CachedResponse = collections.namedtuple("CachedResponse", ["status_code", "content"])
+_cache = None
+_cache_lock = threading.Lock()
+
+def http_get(url, session=None):
+    """
+    GETs url through session (SESSION by default), or replays it from the
+    cache when enabled.
+    
+    Returns an object with status_code and content (the requests response,
+    or a CachedResponse). The URL includes the app id and principal query, so
+    it is the cache key.
+    """
+    global _cache
+    session = session or SESSION
+    if not CACHE_PATH:
+        return session.get(url, timeout=TIMEOUT)
+    
+    # shelve is not thread-safe; fetches run on a thread pool
+    with _cache_lock:
+        if _cache is None:
+            _cache = shelve.open(CACHE_PATH)
+            atexit.register(_cache.close)
+        entry = _cache.get(url)
+    if entry is not None and time.time() - entry[2] < CACHE_TTL:
+        return CachedResponse(entry[0], entry[1])
+    
+    response = session.get(url, timeout=TIMEOUT)
+    if response.status_code == 200:
+        with _cache_lock:
+            _cache[url] = (response.status_code, response.content, time.time())
+    return response
+
+@functools.lru_cache(maxsize=1)
 def get_first_app_id():
     """
     Fetches the list of applications and returns the ID of the first one.
-    """
-    url = f"{BASE_URL}/v1/apps"
-    headers = {
-        "X-API-Key": API_KEY
-    }
     
+    The result is cached for the process, so checking several principals
+    lists the apps only once.
+    """
     try:
-        response = requests.get(url, headers=headers)
+        response = http_get(APPS_URL)
         if response.status_code == 200:
-            apps = response.json()
+            apps = _json_loads(response.content)
             if apps and len(apps) > 0:
                 return apps[0]["id"]
             else:
@@ -27,63 +110,118 @@ def get_first_app_id():
                 return None
         else:
             print(f"Error fetching apps: {response.status_code}")
-            print(response.text)
+            print(response.content.decode(errors="replace"))
             return None
     except Exception as e:
         print(f"Error fetching apps: {e}")
         return None
 
-def get_permissions_rest(app_id, principal_type, principal_id):
-    """
-    Calls the REST API to get permissions/entitlements for a principal.
-    """
-    print(f"\n--- Requesting Permissions via REST ---")
-    print(f"App ID: {app_id}")
-    print(f"Principal: {principal_type}::{principal_id}")
+def _pretty_json(data):
+    """Format data as indented JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
 
-    # Construct the URL
-    url = f"{BASE_URL}/v1/apps/{app_id}/permissions"
-    params = {
+@functools.lru_cache(maxsize=None)
+def _principal_query(principal_type, principal_id):
+    """Encoded principal query string, built once per principal."""
+    return urlencode({
         "principal_type": principal_type,
         "principal_id": principal_id
-    }
-    headers = {
-        "X-API-Key": API_KEY
-    }
+    })
 
+def fetch_permissions(app_id, principal_type, principal_id, session=None):
+    """
+    Requests the permissions for a principal and returns the raw response.
+    """
+    url = PERMS_URL_TMPL.format(app_id) + "?" + _principal_query(principal_type, principal_id)
+    return http_get(url, session)
+
+def get_permissions_rest(app_id, principal_type, principal_id, pending=None, verbose=False,
+                         session=None):
+    """
+    Calls the REST API to get permissions/entitlements for a principal.
+    
+    pending may be a Future from fetch_permissions that is already in
+    flight; its result (or exception) is reported the same way. The full
+    response is only formatted and printed when verbose is set. session
+    defaults to SESSION; pytest passes its http fixture. The report
+    is written in one go, so concurrent callers do not interleave.
+    """
+    lines = [
+        "",
+        "--- Requesting Permissions via REST ---",
+        f"App ID: {app_id}",
+        f"Principal: {principal_type}::{principal_id}",
+    ]
+    data = None
+    
     try:
-        response = requests.get(url, params=params, headers=headers)
+        if pending is not None:
+            response = pending.result()
+        else:
+            response = fetch_permissions(app_id, principal_type, principal_id, session)
         
         # Check if request was successful
         if response.status_code == 200:
-            data = response.json()
-            print("Response Status: 200 OK")
-            print("Permissions Response:")
-            print(json.dumps(data, indent=2))
-            return data
+            data = _json_loads(response.content)
+            lines.append("Response Status: 200 OK")
+            if verbose:
+                lines.append("Permissions Response:")
+                lines.append(_pretty_json(data))
+            else:
+                permissions = data.get("permissions") or []
+                lines.append(f"Permissions: {len(permissions)} entries (-v for the full response)")
         else:
-            print(f"Error: {response.status_code}")
-            print(response.text)
-            return None
-
-    except requests.exceptions.RequestException as e:
-        print(f"Request Error: {e}")
-        return None
+            lines.append(f"Error: {response.status_code}")
+            lines.append(response.content.decode(errors="replace"))
+    
+    except requests.RequestException as e:
+        lines.append(f"Request Error: {e}")
     except Exception as e:
-        print(f"Error: {e}")
-        return None
+        lines.append(f"Error: {e}")
+        data = None
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    return data
+
+def test_permissions_rest(http, app_id, principal):
+    """
+    pytest entry point: the permissions request succeeds for a principal.
+    
+    http and app_id come from conftest.py, so the fixture owns the
+    connection; principal is parametrized over PRINCIPALS there, so
+    pytest-xdist can spread principals across workers.
+    """
+    principal_type, principal_id = principal
+    assert get_permissions_rest(app_id, principal_type, principal_id, session=http) is not None
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="REST permissions test")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Print each full permissions response")
+    args = parser.parse_args()
+    
     # Get dynamic app ID
     app_id = get_first_app_id()
     
     if app_id:
-        # 1. Check permissions for alice
-        get_permissions_rest(
-            app_id=app_id,
-            principal_type="User",
-            principal_id="alice"
-        )
+        # Issue every principal's request at once over the shared session,
+        # then report them in order
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(PRINCIPALS))) as ex:
+            pending = [
+                (principal_type, principal_id,
+                 ex.submit(fetch_permissions, app_id, principal_type, principal_id))
+                for principal_type, principal_id in PRINCIPALS
+            ]
+            for principal_type, principal_id, future in pending:
+                get_permissions_rest(
+                    app_id=app_id,
+                    principal_type=principal_type,
+                    principal_id=principal_id,
+                    pending=future,
+                    verbose=args.verbose
+                )
     else:
         print("Skipping tests due to missing application.")
 